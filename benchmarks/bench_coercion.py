@@ -0,0 +1,87 @@
+"""Micro-benchmark: schema-compiled RecordCoercer vs the legacy per-record cast_ids walk.
+
+Usage:
+    python benchmarks/bench_coercion.py [--records 2000] [--surveys 10] [--repeat 5]
+"""
+
+import argparse
+import copy
+import timeit
+
+from tap_on24.coercion import RecordCoercer
+from tap_on24.streams import ON24AttendeesStream
+
+
+def cast_ids(obj):
+    """The recursive cast the attendee/registrant loops used to run on every record."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k.endswith("id") and v is not None:
+                try:
+                    obj[k] = int(v)
+                except (ValueError, TypeError):
+                    obj[k] = None
+            elif isinstance(v, list) and k not in ("pollanswers", "surveyanswers"):
+                for item in v:
+                    cast_ids(item)
+            elif isinstance(v, dict):
+                cast_ids(v)
+    elif isinstance(obj, list):
+        for item in obj:
+            cast_ids(item)
+
+
+def make_attendee(i: int, surveys: int) -> dict:
+    return {
+        "eventid": "1234",
+        "eventuserid": str(100000 + i),
+        "email": f"user{i}@example.com",
+        "liveminutes": "42",
+        "sourceeventid": "99",
+        "questions": [{"questionid": str(q), "content": "Question?"} for q in range(3)],
+        "polls": [{"pollid": str(p), "pollquestionid": str(p), "pollanswers": ["1", "2"],
+                   "pollanswersdetail": [{"answercode": "A", "answer": "Yes"}]} for p in range(5)],
+        "resources": [{"resourceid": str(r), "resourceviewed": "Y"} for r in range(5)],
+        "surveys": [{
+            "surveyid": str(s),
+            "surveyquestions": [{
+                "surveyquestionid": str(q),
+                "surveyquestion": "How was it?",
+                "surveyanswers": ["Great"],
+                "surveyanswersdetail": [{"answercode": "5", "answer": "Great"}],
+            } for q in range(10)],
+        } for s in range(surveys)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--surveys", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = [make_attendee(i, args.surveys) for i in range(args.records)]
+    coercer = RecordCoercer(ON24AttendeesStream.schema)
+
+    def run_legacy():
+        for record in copy.deepcopy(page):
+            cast_ids(record)
+
+    def run_compiled():
+        coercer.coerce_page(copy.deepcopy(page))
+
+    def run_copy_only():
+        copy.deepcopy(page)
+
+    baseline = min(timeit.repeat(run_copy_only, number=1, repeat=args.repeat))
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat)) - baseline
+    compiled = min(timeit.repeat(run_compiled, number=1, repeat=args.repeat)) - baseline
+    print(f"{args.records} attendees x {args.surveys} surveys (deepcopy cost subtracted)")
+    print(f"  cast_ids:      {legacy * 1000:8.1f} ms  ({args.records / legacy:,.0f} records/s)")
+    print(f"  RecordCoercer: {compiled * 1000:8.1f} ms  ({args.records / compiled:,.0f} records/s)")
+    print(f"  speedup:       {legacy / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Micro-benchmark: Singer record emission on the default SDK path vs fast_output.
+
+Emits coerced attendee records through the attendees stream's real schema,
+stream maps and message writer, with stdout sent to /dev/null.
+
+Usage:
+    python benchmarks/bench_output.py [--records 2000] [--surveys 10] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import copy
+import os
+import timeit
+
+from bench_coercion import make_attendee
+from tap_on24.output import orjson
+from tap_on24.tap import TapON24
+
+
+def make_tap(fast_output: bool) -> TapON24:
+    return TapON24(config={
+        "client_id": "1",
+        "access_token_key": "bench",
+        "access_token_secret": "bench",
+        "on24_start_date": "2024-01-01",
+        "fast_output": fast_output,
+    }, parse_env_config=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--surveys", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    default_tap, fast_tap = make_tap(False), make_tap(True)
+    page = default_tap.streams["attendees"].coercer.coerce_page(
+        make_attendee(i, args.surveys) for i in range(args.records)
+    )
+
+    def emitter(tap: TapON24):
+        stream = tap.streams["attendees"]
+        tap.message_writer.fast = bool(tap.config.get("fast_output"))
+
+        def run():
+            for record in copy.deepcopy(page):
+                stream._write_record_message(record)
+            tap.message_writer.flush()
+        return run
+
+    def run_copy_only():
+        copy.deepcopy(page)
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        baseline = min(timeit.repeat(run_copy_only, number=1, repeat=args.repeat))
+        default = min(timeit.repeat(emitter(default_tap), number=1, repeat=args.repeat)) - baseline
+        fast = min(timeit.repeat(emitter(fast_tap), number=1, repeat=args.repeat)) - baseline
+    encoder = "orjson" if orjson is not None else "simplejson (orjson not installed)"
+    print(f"{args.records} attendees x {args.surveys} surveys (deepcopy cost subtracted)")
+    print(f"  default output: {default * 1000:8.1f} ms  ({args.records / default:,.0f} records/s)")
+    print(f"  fast_output:    {fast * 1000:8.1f} ms  ({args.records / fast:,.0f} records/s, {encoder})")
+    print(f"  speedup:        {default / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""End-to-end throughput benchmark: run TapON24 against the local mock ON24 server.
+
+Reports records/sec, requests/sec, bytes emitted, peak RSS and p50/p99 page latency.
+
+Usage:
+    python benchmarks/bench_sync.py --events 100 --attendees 300 --latency-ms 50 --max-workers 8
+    python benchmarks/bench_sync.py --tap-config '{"prefetch_pages": 0}' --json
+    python benchmarks/bench_sync.py --deselect attendees.surveys,attendees.polls,attendees.questions
+"""
+
+import argparse
+import contextlib
+import json
+import resource
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+from mock_server import MockON24Server, add_arguments, config_from_args
+from tap_on24.tap import TapON24
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class CountingSink:
+    """Stand-in for stdout that only counts the bytes the tap emits."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def deselected_catalog(tap_config: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """The discovered catalog with each "stream.property" in `fields` deselected."""
+    catalog = TapON24(config=tap_config, parse_env_config=False).catalog_dict
+    wanted = {tuple(field.split(".", 1)) for field in fields}
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            breadcrumb = metadata["breadcrumb"]
+            if len(breadcrumb) == 2 and (entry["tap_stream_id"], breadcrumb[1]) in wanted:
+                metadata["metadata"]["selected"] = False
+    return catalog
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mock_config = config_from_args(args)
+    with MockON24Server(mock_config) as server:
+        tap_config = {
+            "client_id": "1",
+            "access_token_key": "bench",
+            "access_token_secret": "bench",
+            "api_url": server.url,
+            "on24_start_date": mock_config.start_date,
+            "on24_end_date": args.end_date,
+            "items_per_page": args.items_per_page,
+            "max_workers": args.max_workers,
+        }
+        tap_config.update(json.loads(args.tap_config or "{}"))
+        catalog = deselected_catalog(tap_config, args.deselect.split(",")) if args.deselect else None
+        tap = TapON24(config=tap_config, catalog=catalog, parse_env_config=False)
+
+        latencies: List[float] = []
+        lock = threading.Lock()
+
+        def record_latency(response, *hook_args, **hook_kwargs):
+            with lock:
+                latencies.append(response.elapsed.total_seconds())
+
+        tap.client.session.hooks["response"].append(record_latency)
+        sink = CountingSink()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            tap.sync_all()
+        elapsed = time.perf_counter() - started
+        served = server.stats.as_dict()
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "records": served["records"],
+        "records_per_s": round(served["records"] / elapsed, 1),
+        "requests": served["requests"],
+        "requests_per_s": round(served["requests"] / elapsed, 1),
+        "errors_429": served["errors_429"],
+        "errors_5xx": served["errors_5xx"],
+        "mb_served": round(served["bytes_out"] / 1e6, 2),
+        "mb_emitted": round(sink.bytes / 1e6, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "page_latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "page_latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TapON24 against a local mock ON24 API.")
+    add_arguments(parser)
+    parser.add_argument("--end-date", default="2024-12-31")
+    parser.add_argument("--items-per-page", type=int, default=100)
+    parser.add_argument("--max-workers", type=int, default=1)
+    parser.add_argument("--tap-config", help="JSON object merged into the tap config")
+    parser.add_argument("--deselect", help="comma-separated stream.property list to deselect in the catalog")
+    parser.add_argument("--json", action="store_true", help="print the result as one JSON object")
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result))
+        return
+    width = max(len(k) for k in result)
+    for key, value in result.items():
+        print(f"{key:<{width}}  {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Local stand-in for the ON24 REST API, for benchmarks and offline runs.
+
+Serves synthetic, deterministic data for:
+
+    GET /v2/client/{client_id}/event
+    GET /v2/client/{client_id}/event/{event_id}/attendee
+    GET /v2/client/{client_id}/event/{event_id}/registrant
+
+and can inject latency, 429s (with Retry-After) and 5xx errors.
+
+Usage:
+    python benchmarks/mock_server.py --port 8024 --events 200 --attendees 500 --latency-ms 80
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+ROUTE = re.compile(r"^/v2/client/(?P<client_id>[^/]+)/event(?:/(?P<event_id>\d+)/(?P<kind>attendee|registrant))?/?$")
+
+
+@dataclass
+class MockConfig:
+    events: int = 50
+    attendees_per_event: int = 200
+    registrants_per_event: int = 250
+    surveys_per_attendee: int = 2
+    questions_per_survey: int = 5
+    start_date: str = "2024-01-01"
+    days: int = 365
+    empty_event_ratio: float = 0.1
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after: float = 0.0
+    seed: int = 24
+
+
+class MockStats:
+    """Counters shared by all handler threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.records = 0
+        self.errors_429 = 0
+        self.errors_5xx = 0
+        self.bytes_out = 0
+
+    def add(self, **counts: int) -> None:
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self.lock:
+            return {name: getattr(self, name) for name in ("requests", "records", "errors_429", "errors_5xx", "bytes_out")}
+
+
+class MockData:
+    """Deterministic synthetic events, attendees and registrants."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        rng = random.Random(config.seed)
+        start = date.fromisoformat(config.start_date)
+        self.events: List[Dict[str, Any]] = []
+        for i in range(config.events):
+            event_date = start + timedelta(days=rng.randrange(max(1, config.days)))
+            empty = rng.random() < config.empty_event_ratio
+            self.events.append({
+                "eventid": 4000000 + i,
+                "clientid": 1,
+                "description": f"Synthetic webinar {i}",
+                "eventtype": "Live",
+                "createtimestamp": f"{event_date.isoformat()}T09:00:00-05:00",
+                "livestart": f"{event_date.isoformat()}T11:00:00-05:00",
+                "lastupdated": f"{event_date.isoformat()}T12:00:00-05:00",
+                "istestevent": i % 25 == 0,
+                "tags": ["synthetic"],
+                "eventanalytics": {
+                    "totalattendees": 0 if empty else config.attendees_per_event,
+                    "totalregistrants": 0 if empty else config.registrants_per_event,
+                },
+            })
+        self.events.sort(key=lambda e: e["createtimestamp"])
+        self.by_id = {e["eventid"]: e for e in self.events}
+
+    def list_events(self, start_date: Optional[str], end_date: Optional[str]) -> List[Dict[str, Any]]:
+        return [
+            e for e in self.events
+            if (not start_date or e["createtimestamp"][:10] >= start_date)
+            and (not end_date or e["createtimestamp"][:10] <= end_date)
+        ]
+
+    def attendee(self, event_id: int, n: int) -> Dict[str, Any]:
+        c = self.config
+        return {
+            "eventuserid": str(event_id * 10000 + n),
+            "email": f"attendee{n}@example.com",
+            "userstatus": "Attended",
+            "engagementscore": 5.5,
+            "liveminutes": str(n % 60),
+            "lastliveactivity": "2024-06-01T11:45:00-05:00",
+            "questions": [{"questionid": str(n), "content": "Synthetic question?"}],
+            "polls": [{"pollid": "7", "pollquestionid": "8", "pollanswers": ["Yes"]}],
+            "surveys": [{
+                "surveyid": str(s),
+                "surveyquestions": [{
+                    "surveyquestionid": str(q),
+                    "surveyquestion": "How useful was this session?",
+                    "surveyanswers": ["Very"],
+                    "surveyanswersdetail": [{"answercode": "5", "answer": "Very"}],
+                } for q in range(c.questions_per_survey)],
+            } for s in range(c.surveys_per_attendee)],
+        }
+
+    def registrant(self, event_id: int, n: int) -> Dict[str, Any]:
+        return {
+            "eventuserid": str(event_id * 10000 + n),
+            "firstname": "Synthetic",
+            "lastname": f"User{n}",
+            "email": f"registrant{n}@example.com",
+            "company": "Example Corp",
+            "createtimestamp": "2024-05-01T10:00:00-05:00",
+            "lastactivity": "2024-06-01T11:45:00-05:00",
+            "sourceeventid": str(event_id),
+        }
+
+
+def make_handler(data: MockData, stats: MockStats, config: MockConfig):
+    rng = random.Random(config.seed + 1)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+            pass
+
+        def send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+            stats.add(bytes_out=len(payload))
+
+        def do_GET(self):  # noqa: N802 - http.server API
+            stats.add(requests=1)
+            with rng_lock:
+                roll = rng.random()
+                delay = config.latency_ms + rng.uniform(0, config.latency_jitter_ms)
+            if delay:
+                time.sleep(delay / 1000.0)
+            if roll < config.rate_429:
+                stats.add(errors_429=1)
+                return self.send_json(429, {"message": "Too Many Requests"}, {"Retry-After": str(config.retry_after)})
+            if roll < config.rate_429 + config.rate_5xx:
+                stats.add(errors_5xx=1)
+                return self.send_json(503, {"message": "Service Unavailable"})
+
+            url = urlparse(self.path)
+            match = ROUTE.match(url.path)
+            if not match:
+                return self.send_json(404, {"message": "Not Found"})
+            query = parse_qs(url.query)
+            items_per_page = int(query.get("itemsPerPage", ["100"])[0])
+            page_offset = int(query.get("pageOffset", ["0"])[0])
+            lo, hi = page_offset * items_per_page, (page_offset + 1) * items_per_page
+
+            if match.group("event_id") is None:
+                events = data.list_events(query.get("startDate", [None])[0], query.get("endDate", [None])[0])
+                page = events[lo:hi]
+                stats.add(records=len(page))
+                return self.send_json(200, {"totalevents": len(events), "currentpage": page_offset, "events": page})
+
+            event_id = int(match.group("event_id"))
+            event = data.by_id.get(event_id)
+            if event is None:
+                return self.send_json(404, {"message": f"Event {event_id} not found"})
+            if match.group("kind") == "attendee":
+                total = event["eventanalytics"]["totalattendees"]
+                page = [data.attendee(event_id, n) for n in range(lo, min(hi, total))]
+                key = "attendees"
+            else:
+                total = event["eventanalytics"]["totalregistrants"]
+                page = [data.registrant(event_id, n) for n in range(lo, min(hi, total))]
+                key = "registrants"
+            stats.add(records=len(page))
+            return self.send_json(200, {f"total{key}": total, "currentpage": page_offset, key: page})
+
+    return Handler
+
+
+class MockON24Server:
+    """Run the stand-in API on a background thread.
+
+    Example:
+        with MockON24Server(MockConfig(events=10)) as server:
+            config["api_url"] = server.url
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.data = MockData(self.config)
+        self.stats = MockStats()
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.data, self.stats, self.config))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-on24", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockON24Server":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockON24Server":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = MockConfig()
+    parser.add_argument("--events", type=int, default=defaults.events)
+    parser.add_argument("--attendees", type=int, default=defaults.attendees_per_event, help="attendees per event")
+    parser.add_argument("--registrants", type=int, default=defaults.registrants_per_event, help="registrants per event")
+    parser.add_argument("--surveys", type=int, default=defaults.surveys_per_attendee, help="surveys per attendee (payload size)")
+    parser.add_argument("--questions", type=int, default=defaults.questions_per_survey, help="questions per survey (payload size)")
+    parser.add_argument("--start-date", default=defaults.start_date)
+    parser.add_argument("--days", type=int, default=defaults.days, help="spread events over this many days")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--latency-jitter-ms", type=float, default=defaults.latency_jitter_ms)
+    parser.add_argument("--rate-429", type=float, default=defaults.rate_429, help="fraction of requests answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=defaults.rate_5xx, help="fraction of requests answered with 503")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        events=args.events,
+        attendees_per_event=args.attendees,
+        registrants_per_event=args.registrants,
+        surveys_per_attendee=args.surveys,
+        questions_per_survey=args.questions,
+        start_date=args.start_date,
+        days=args.days,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the ON24 REST API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8024)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = MockON24Server(config_from_args(args), host=args.host, port=args.port)
+    print(f"Mock ON24 API listening on {server.url} (set api_url to this)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
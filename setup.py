@@ -8,9 +8,17 @@ setup(
     author_email="dev@thedailyupside.com",
     packages=find_packages(),
     install_requires=[
-        "singer-sdk>=0.13.0",
+        "singer-sdk>=0.45.11",
         "requests>=2.25.1",
     ],
+    extras_require={
+        # Faster JSON encoding for the fast_output setting
+        "fast": ["orjson>=3.0"],
+        # http_engine "asyncio"
+        "async": ["aiohttp>=3.8"],
+        # python -m pytest
+        "test": ["pytest>=7"],
+    },
     entry_points={
         "console_scripts": [
             "tap-on24=tap_on24.tap:TapON24.cli",
@@ -0,0 +1,193 @@
+"""asyncio variant of ON24Client: many pages in flight from one event loop thread."""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+from functools import partial
+from typing import Any, Awaitable, Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:  # optional: only needed for http_engine "asyncio"
+    aiohttp = None
+
+from tap_on24.cassette import ResponseCache
+from tap_on24.client import RETRYABLE_STATUS_CODES, ON24ClientBase, Retry, parse_retry_after
+from tap_on24.metrics import RunMetrics
+from tap_on24.paging import PageSizer
+
+
+class AsyncEngine:
+    """One event loop, run in a daemon thread, that every async client of the tap shares.
+
+    Stream generators stay synchronous: they `submit` coroutines and block on the
+    returned futures, so the only thread doing I/O is the loop's.
+    """
+
+    def __init__(self):
+        if aiohttp is None:
+            raise Exception("http_engine 'asyncio' needs aiohttp: pip install tap-on24[async].")
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="on24-asyncio", daemon=True)
+        self.thread.start()
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable) -> Any:
+        return self.submit(coro).result()
+
+    def close(self, *clients: "AsyncON24Client") -> None:
+        """Close `clients`' sessions, then stop the loop."""
+        for client in clients:
+            self.run(client.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class AsyncTokenBucket:
+    """Token bucket for coroutines on one loop: waiting awaits instead of sleeping a thread."""
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(1.0, burst if burst else (self.rate or 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    async def acquire(self) -> float:
+        """Wait until a token is available; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            # No await between reading and taking a token: coroutines on one loop can't interleave here
+            now = time.monotonic()
+            wait = self.blocked_until - now
+            if wait <= 0:
+                if self.rate is None:
+                    return waited
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class AsyncON24Client(ON24ClientBase):
+    """ON24Client's get_events/get_attendees/get_registrants as coroutines, on aiohttp.
+
+    Retries, backoff, Retry-After, the response cache, metrics and page sizers work
+    as in ON24Client; backoff awaits instead of blocking a thread. At most
+    `max_concurrency` requests are in flight (a semaphore, and the size of the
+    connection pool). The session and semaphore are created on first use, inside
+    the engine's loop. Pages are always loaded whole (no stream_json).
+    """
+
+    def __init__(self, client_id: str, access_token_key: str, access_token_secret: str,
+                 api_url: Optional[str] = None, max_concurrency: int = 100, requests_per_second: Optional[float] = None,
+                 max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 request_timeout: float = 300.0, metrics: Optional[RunMetrics] = None,
+                 cache: Optional[ResponseCache] = None, page_sizers: Optional[Dict[str, PageSizer]] = None):
+        super().__init__(client_id, access_token_key, access_token_secret, api_url=api_url, max_retries=max_retries,
+                         backoff_base=backoff_base, backoff_max=backoff_max, request_timeout=request_timeout,
+                         metrics=metrics, cache=cache, page_sizers=page_sizers)
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = AsyncTokenBucket(requests_per_second)
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def _session(self) -> "aiohttp.ClientSession":
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.get_headers(),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _request(self, url: str, params: Dict[str, Any], label: str, endpoint: str) -> Dict[str, Any]:
+        """ON24Client._request on aiohttp, awaiting the network, backoff and rate limiter."""
+        cached = self._cached(url, params, endpoint)
+        if cached is not None:
+            return cached
+        session = self._session()
+        retry = Retry(self, label, endpoint)
+        for attempt in retry.attempts():
+            waited = await self.rate_limiter.acquire()
+            status, retry_after = None, None
+            async with self.semaphore:
+                started = time.perf_counter()
+                try:
+                    async with session.get(url, params=params) as response:
+                        status, reason = response.status, str(response.status)
+                        body = await response.read()
+                        if status in RETRYABLE_STATUS_CODES:
+                            retry_after = parse_retry_after(response)
+                        else:
+                            if status == 400:
+                                logging.error(f"[ON24Client] 400 Bad Request ({label}): {body.decode(errors='replace')}")
+                            response.raise_for_status()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    status, reason = None, type(e).__name__
+            elapsed = time.perf_counter() - started
+            self._attempted(endpoint, reason, elapsed, waited)
+            if status is not None and status not in RETRYABLE_STATUS_CODES:
+                return self._page_loaded(url, params, endpoint, body, partial(json.loads, body), elapsed, retry.errors)
+            wait = retry.failed(attempt, status, reason, retry_after)
+            if wait is None:
+                break
+            if wait:
+                await asyncio.sleep(wait)
+        raise retry.exhausted()
+
+    async def get_events(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         items_per_page: int = 100, page_offset: int = 0,
+                         date_filter_mode: Optional[str] = None) -> Dict[str, Any]:
+        items_per_page = max(10, items_per_page)
+        url = self.BASE_URL.format(client_id=self.client_id)
+        params = {
+            "itemsPerPage": items_per_page,
+            "pageOffset": page_offset
+        }
+        if start_date:
+            params["startDate"] = start_date
+        if end_date:
+            params["endDate"] = end_date
+        if date_filter_mode:
+            params["dateFilterMode"] = date_filter_mode
+        return await self._request(url, params, f"events (page {page_offset})", "events")
+
+    async def get_attendees(self, event_id: int, items_per_page: int = 100, page_offset: int = 0) -> Dict[str, Any]:
+        items_per_page = max(10, items_per_page)
+        url = f"{self.BASE_URL.format(client_id=self.client_id)}/{event_id}/attendee"
+        params = {
+            "itemsPerPage": items_per_page,
+            "pageOffset": page_offset
+        }
+        return await self._request(url, params, f"attendees (event {event_id}, page {page_offset})", "attendees")
+
+    async def get_registrants(self, event_id: int, items_per_page: int = 100, page_offset: int = 0) -> Dict[str, Any]:
+        items_per_page = max(10, items_per_page)
+        url = f"{self.BASE_URL.format(client_id=self.client_id)}/{event_id}/registrant"
+        params = {
+            "itemsPerPage": items_per_page,
+            "pageOffset": page_offset
+        }
+        return await self._request(url, params, f"registrants (event {event_id}, page {page_offset})", "registrants")
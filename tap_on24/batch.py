@@ -0,0 +1,69 @@
+"""JSONL batch files for BATCH message output (the SDK's batch_config)."""
+
+import gzip
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+from uuid import uuid4
+
+from singer_sdk.batch import BaseBatcher
+
+from tap_on24.output import dumps
+
+
+def file_url(root: str, filename: str) -> str:
+    """URL of `filename` under a storage root, as the manifest lists it.
+
+    Local roots (a path or file://) resolve to an absolute file:// URL; remote ones
+    (s3://bucket/dir, ...) get the file name appended. Query parameters on the root
+    are connection options, not part of the file's address.
+    """
+    parsed = urlparse(root)
+    if parsed.scheme in ("", "file"):
+        path = parsed.netloc + parsed.path if parsed.scheme else root
+        return Path(path or ".").resolve().joinpath(filename).as_uri()
+    return parsed._replace(query="").geturl().rstrip("/") + "/" + filename
+
+
+class ON24JSONLBatcher(BaseBatcher):
+    """Write records to JSONL files, gzip-compressed unless `compression` is "none".
+
+    A file is closed once it holds `batch_config.batch_size` records or `max_bytes`
+    bytes of JSONL (measured before compression), whichever comes first. Each file is
+    its own manifest, so the SDK emits a BATCH message and a STATE message per file.
+    """
+
+    def __init__(self, tap_name: str, stream_name: str, batch_config, max_bytes: Optional[int] = None):
+        super().__init__(tap_name, stream_name, batch_config)
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+
+    def get_batches(self, records: Iterable[dict]) -> Iterator[List[str]]:
+        sync_id = f"{self.tap_name}--{self.stream_name}-{uuid4()}"
+        storage = self.batch_config.storage
+        compressed = (self.batch_config.encoding.compression or "gzip") != "none"
+        suffix = ".jsonl.gz" if compressed else ".jsonl"
+        max_rows = max(1, self.batch_config.batch_size)
+        max_bytes = self.max_bytes or float("inf")
+        records = iter(records)
+        pending = next(records, None)
+        part = 0
+        while pending is not None:
+            part += 1
+            filename = f"{storage.prefix or ''}{sync_id}-{part}{suffix}"
+            with storage.open(filename, "wb") as f:
+                out = gzip.GzipFile(fileobj=f, mode="wb") if compressed else f
+                rows = size = 0
+                while pending is not None:
+                    line = dumps(pending) + b"\n"
+                    out.write(line)
+                    rows += 1
+                    size += len(line)
+                    pending = None
+                    if rows < max_rows and size < max_bytes:
+                        pending = next(records, None)
+                if compressed:
+                    out.close()
+            yield [file_url(storage.root, filename)]
+            # Only read on once the file is out: the SDK writes STATE while we are
+            # suspended here, and the stream's checkpoints must not run ahead of it
+            pending = next(records, None)
@@ -0,0 +1,131 @@
+"""On-disk record/replay cache of ON24 API responses ("cassettes")."""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request has no cassette."""
+
+
+class ResponseCache:
+    """One gzip file per (client ID, endpoint path, params), under `path`.
+
+    Modes:
+        record: serve cassettes younger than `ttl` seconds, fetch and store the rest.
+        replay: never touch the network; serve any cassette regardless of age and
+            raise CassetteMiss for requests that have none.
+
+    Each file holds one JSON header line (client ID, path, params, fetch time) followed
+    by the raw response body, so `zcat` shows what a cassette is. Once the directory
+    exceeds `max_bytes`, the least recently used cassettes are deleted.
+    """
+
+    def __init__(self, path: str, mode: str = "record", ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"cache_mode must be 'record' or 'replay' for a cache, got {mode!r}.")
+        self.path = path
+        self.mode = mode
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self.size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.name.endswith(".json.gz"))
+
+    def clock(self, now: float) -> float:
+        """The run's clock: the recorded one if replaying, or recording while it is younger than ttl; else `now`, recorded.
+
+        Dates derived from the clock (the default end date, the lookback start) are
+        part of /event cassette keys, so a replay (or a re-run) on a later day must ask
+        for the same pages as the run that recorded them.
+        """
+        filename = os.path.join(self.path, "clock.json")
+        try:
+            with open(filename) as f:
+                recorded = float(json.load(f)["now"])
+        except (OSError, ValueError, KeyError, TypeError):
+            recorded = None
+        if recorded is not None and (self.mode == "replay" or self.ttl is None or now - recorded <= self.ttl):
+            return recorded
+        if self.mode == "replay":
+            logging.warning(f"[ResponseCache] No recorded clock in {self.path}; replaying as of now.")
+            return now
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w") as f:
+            json.dump({"now": now}, f)
+        os.replace(tmp_filename, filename)
+        return now
+
+    @staticmethod
+    def key(client_id: str, path: str, params: Dict[str, Any]) -> str:
+        # The host is left out so cassettes recorded against one api_url replay against another
+        raw = json.dumps({"client_id": str(client_id), "path": path, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json.gz")
+
+    def get(self, client_id: str, path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The cached response body, decoded; None on a miss (CassetteMiss in replay mode)."""
+        filename = self._file(self.key(client_id, path, params))
+        try:
+            age = time.time() - os.stat(filename).st_mtime
+            if self.mode == "record" and self.ttl is not None and age > self.ttl:
+                return None
+            with gzip.open(filename, "rb") as f:
+                f.readline()
+                body = f.read()
+            # Mark as recently used for eviction
+            os.utime(filename)
+            return json.loads(body)
+        except (OSError, ValueError, EOFError) as e:
+            if self.mode == "replay":
+                raise CassetteMiss(f"No cassette for {path} {params} (client {client_id}) in {self.path}: {e}")
+            return None
+
+    def put(self, client_id: str, path: str, params: Dict[str, Any], body: bytes) -> None:
+        """Store a response body, then evict least recently used cassettes if over max_bytes."""
+        key = self.key(client_id, path, params)
+        filename = self._file(key)
+        header = {"client_id": str(client_id), "path": path, "params": params, "fetched_at": time.time()}
+        tmp_filename = f"{filename}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_filename, "wb") as f:
+            f.write(json.dumps(header, default=str).encode() + b"\n")
+            f.write(body)
+        with self.lock:
+            old_size = os.path.getsize(filename) if os.path.exists(filename) else 0
+            os.replace(tmp_filename, filename)
+            self.size += os.path.getsize(filename) - old_size
+            if self.max_bytes is not None and self.size > self.max_bytes:
+                self._evict(keep=filename)
+
+    def _evict(self, keep: str) -> None:
+        entries = sorted(
+            (entry for entry in os.scandir(self.path) if entry.name.endswith(".json.gz")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        self.size = sum(entry.stat().st_size for entry in entries)
+        evicted = 0
+        for entry in entries:
+            if self.size <= self.max_bytes:
+                break
+            if entry.path == keep:
+                continue
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.size -= size
+            evicted += 1
+        if evicted:
+            logging.info(f"[ResponseCache] Evicted {evicted} cassettes to stay under {self.max_bytes} bytes.")
@@ -1,14 +1,111 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, Optional, Tuple
 
-class ON24Client:
-    """Client for ON24 REST API."""
+from tap_on24.cassette import ResponseCache
+from tap_on24.metrics import PAGE_SIZE_BUCKETS, ON24Metric, RunMetrics
+from tap_on24.paging import PageSizer
+from tap_on24.streaming import StreamedPage
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every request a client makes."""
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        # rate is requests per second; None or <= 0 disables throttling
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(1.0, burst if burst else (self.rate or 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.rate is None:
+                        return waited
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after a Retry-After."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+def parse_retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait according to Retry-After or X-RateLimit-* headers, if any."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset is not None:
+        try:
+            if int(float(remaining)) <= 0:
+                reset = float(reset)
+                # Either an epoch timestamp or a delta in seconds
+                return max(0.0, reset - time.time()) if reset > 1e9 else max(0.0, reset)
+        except ValueError:
+            pass
+    return None
+
+
+class ON24ClientBase:
+    """Credentials, and the cache, metrics, retry and page-size bookkeeping around each request.
+
+    Shared by ON24Client (requests, threads) and AsyncON24Client (aiohttp, one loop):
+    a subclass's `_request` only sends, waits and loops, and leaves every decision and
+    count to these helpers. Subclasses set `rate_limiter`.
+    """
     BASE_URL = "https://api.on24.com/v2/client/{client_id}/event"
 
-    def __init__(self, client_id: str, access_token_key: str, access_token_secret: str):
+    def __init__(self, client_id: str, access_token_key: str, access_token_secret: str,
+                 api_url: Optional[str] = None, max_retries: int = 5, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, request_timeout: float = 300.0, metrics: Optional[RunMetrics] = None,
+                 cache: Optional[ResponseCache] = None, page_sizers: Optional[Dict[str, PageSizer]] = None):
         self.client_id = client_id
         self.access_token_key = access_token_key
         self.access_token_secret = access_token_secret
+        if api_url:
+            # e.g. a regional host, or a local stand-in server for benchmarks
+            self.BASE_URL = api_url.rstrip("/") + "/v2/client/{client_id}/event"
+        self.max_retries = max(1, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self.metrics = metrics or RunMetrics()
+        self.cache = cache
+        # Per-endpoint page sizes, fed with every page this client fetches
+        self.page_sizers = page_sizers or {}
 
     def get_headers(self) -> Dict[str, str]:
         return {
@@ -17,9 +114,198 @@ class ON24Client:
             "Accept": "application/json"
         }
 
+    def _cached(self, url: str, params: Dict[str, Any], endpoint: str) -> Optional[Dict[str, Any]]:
+        """The cassette for this request if the cache has one; otherwise None, and the page size requested is recorded."""
+        if self.cache is not None:
+            cached = self.cache.get(self.client_id, urlparse(url).path, params)
+            self.metrics.increment(ON24Metric.HTTP_CACHE_COUNT, endpoint=endpoint,
+                                   result="miss" if cached is None else "hit")
+            if cached is not None:
+                return cached
+        self.metrics.observe(ON24Metric.PAGE_SIZE, params["itemsPerPage"], buckets=PAGE_SIZE_BUCKETS, endpoint=endpoint)
+        return None
+
+    def _attempted(self, endpoint: str, reason: str, elapsed: float, waited: float) -> None:
+        """Count one attempt: its status code (or error name), latency and rate limiter wait."""
+        metrics = self.metrics
+        if waited:
+            metrics.increment(ON24Metric.RATE_LIMIT_WAIT_DURATION, waited, endpoint=endpoint)
+        metrics.increment(ON24Metric.HTTP_REQUEST_COUNT, endpoint=endpoint, http_status_code=reason)
+        metrics.observe(ON24Metric.HTTP_REQUEST_DURATION, elapsed, endpoint=endpoint)
+        # Endpoint names match the stream names, so stages line up with the streams' own
+        metrics.stage("network", elapsed, stream=endpoint)
+
+    def _page_loaded(self, url: str, params: Dict[str, Any], endpoint: str, body: bytes,
+                     decode: Callable[[], Dict[str, Any]], elapsed: float, errors: int) -> Dict[str, Any]:
+        """Count, cache and decode a page read whole, and report it to its endpoint's PageSizer."""
+        metrics = self.metrics
+        metrics.increment(ON24Metric.HTTP_RESPONSE_BYTES, len(body), endpoint=endpoint)
+        if self.cache is not None:
+            self.cache.put(self.client_id, urlparse(url).path, params, body)
+        started = time.perf_counter()
+        try:
+            data = decode()
+        except ValueError as e:
+            logging.error(f"[ON24Client] Failed to parse JSON response: {e}")
+            raise
+        parsed = time.perf_counter() - started
+        metrics.stage("parse", parsed, stream=endpoint)
+        sizer = self.page_sizers.get(endpoint)
+        if sizer is not None:
+            # The records array is named after the endpoint (events, attendees, registrants)
+            sizer.observe(params["itemsPerPage"], len(data.get(endpoint) or []), elapsed + parsed, len(body), errors)
+        return data
+
+
+class Retry:
+    """One request's attempts: whether to try again, and how long to back off first."""
+
+    def __init__(self, client: ON24ClientBase, label: str, endpoint: str):
+        self.client = client
+        self.label = label
+        self.endpoint = endpoint
+        self.sleep = client.backoff_base
+        # Failures other than throttling so far: the page errors a PageSizer is told about
+        self.errors = 0
+        self.status: Optional[int] = None
+        self.reason = ""
+
+    def attempts(self) -> range:
+        return range(self.client.max_retries)
+
+    def failed(self, attempt: int, status: Optional[int], reason: str, retry_after: Optional[float]) -> Optional[float]:
+        """Count a retryable failure; return the seconds to wait before the next attempt, or None to give up.
+
+        Throttling is client-wide: a 429 holds back the client's whole rate limiter
+        instead, and the caller has nothing more to wait for itself (0).
+        """
+        client = self.client
+        metrics = client.metrics
+        self.status, self.reason = status, reason
+        if status == 429:
+            metrics.increment(ON24Metric.HTTP_THROTTLED_COUNT, endpoint=self.endpoint)
+        else:
+            # Throttling is about request rate, not page size: only these count as page errors
+            self.errors += 1
+        if attempt == client.max_retries - 1:
+            return None
+        # Decorrelated jitter, unless the server told us exactly how long to wait
+        self.sleep = min(client.backoff_max, random.uniform(client.backoff_base, self.sleep * 3))
+        if retry_after is not None:
+            self.sleep = min(client.backoff_max, retry_after) + random.uniform(0, client.backoff_base)
+        logging.warning(f"{reason} for {self.label} (attempt {attempt+1}), backing off {self.sleep:.1f} seconds.")
+        metrics.increment(ON24Metric.RETRY_SLEEP_DURATION, self.sleep, endpoint=self.endpoint)
+        if status == 429:
+            client.rate_limiter.pause(self.sleep)
+            return 0.0
+        return self.sleep
+
+    def exhausted(self) -> Exception:
+        if self.status == 429:
+            return Exception(f"Max retries exceeded for {self.label} due to throttling.")
+        return Exception(f"Max retries exceeded for {self.label}: {self.reason}.")
+
+
+class ON24Client(ON24ClientBase):
+    """Client for ON24 REST API."""
+
+    def __init__(self, client_id: str, access_token_key: str, access_token_secret: str,
+                 api_url: Optional[str] = None, pool_maxsize: int = 10, requests_per_second: Optional[float] = None,
+                 max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 request_timeout: float = 300.0, metrics: Optional[RunMetrics] = None,
+                 cache: Optional[ResponseCache] = None, page_sizers: Optional[Dict[str, PageSizer]] = None):
+        super().__init__(client_id, access_token_key, access_token_secret, api_url=api_url, max_retries=max_retries,
+                         backoff_base=backoff_base, backoff_max=backoff_max, request_timeout=request_timeout,
+                         metrics=metrics, cache=cache, page_sizers=page_sizers)
+        self.rate_limiter = TokenBucket(requests_per_second)
+        # One keep-alive session for every request so page calls reuse TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update(self.get_headers())
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_maxsize))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _request(self, url: str, params: Dict[str, Any], label: str, endpoint: str,
+                 stream_key: Optional[str] = None) -> Dict[str, Any]:
+        """GET `url` through the shared rate limiter, retrying throttling and transient failures.
+
+        With `stream_key`, the body is not loaded: a StreamedPage parses that array lazily,
+        and requests the page again if the connection drops while it is being read.
+        Requests, bytes, latency, throttling and backoff are counted per `endpoint`, and
+        each page is reported to that endpoint's PageSizer (a streamed one once it is read).
+        With a response cache, a cassette is served instead when there is one; cached
+        responses are always loaded whole.
+        """
+        cached = self._cached(url, params, endpoint)
+        if cached is not None:
+            return cached
+        if self.cache is not None:
+            stream_key = None
+        response, elapsed, errors = self._get(url, params, label, endpoint, stream=stream_key is not None)
+        if stream_key is None:
+            return self._page_loaded(url, params, endpoint, response.content, response.json, elapsed, errors)
+        try:
+            return StreamedPage(response, stream_key,
+                                on_complete=self._streamed_page_done(params, endpoint, elapsed, errors),
+                                reopen=lambda: self._get(url, params, label, endpoint, stream=True)[0],
+                                max_resumes=self.max_retries)
+        except Exception as e:
+            logging.error(f"[ON24Client] Failed to parse JSON response: {e}")
+            response.close()
+            raise
+
+    def _get(self, url: str, params: Dict[str, Any], label: str, endpoint: str,
+             stream: bool = False) -> Tuple[requests.Response, float, int]:
+        """The retrying GET behind `_request`: (successful response, seconds to headers, page errors retried)."""
+        retry = Retry(self, label, endpoint)
+        for attempt in retry.attempts():
+            waited = self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.request_timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, reason = None, type(e).__name__
+            else:
+                reason = str(response.status_code)
+            elapsed = time.perf_counter() - started
+            self._attempted(endpoint, reason, elapsed, waited)
+            if response is None:
+                wait = retry.failed(attempt, None, reason, None)
+            elif response.status_code not in RETRYABLE_STATUS_CODES:
+                if response.status_code == 400:
+                    logging.error(f"[ON24Client] 400 Bad Request ({label}): {response.text}")
+                response.raise_for_status()
+                return response, elapsed, retry.errors
+            else:
+                wait = retry.failed(attempt, response.status_code, reason, parse_retry_after(response))
+                # Release the connection back to the pool before retrying
+                response.close()
+            if wait is None:
+                break
+            if wait:
+                time.sleep(wait)
+        if response is not None and response.status_code != 429:
+            response.raise_for_status()
+        raise retry.exhausted()
+
+    def _streamed_page_done(self, params: Dict[str, Any], endpoint: str, elapsed: float,
+                            errors: int) -> Callable[[StreamedPage], None]:
+        """Report a streamed page's bytes, and feed its endpoint's PageSizer, once it has been read to the end."""
+        def done(page: StreamedPage) -> None:
+            self.metrics.increment(ON24Metric.HTTP_RESPONSE_BYTES, page.bytes_read, endpoint=endpoint)
+            sizer = self.page_sizers.get(endpoint)
+            if sizer is not None:
+                # A page read again after a dropped connection counts as one more error
+                sizer.observe(params["itemsPerPage"], page.count, elapsed + page.seconds, page.bytes_read,
+                              errors + page.resumes)
+        return done
+
     def get_events(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
-                   items_per_page: int = 100, page_offset: int = 0) -> Dict[str, Any]:
-        import time, logging
+                   items_per_page: int = 100, page_offset: int = 0,
+                   date_filter_mode: Optional[str] = None) -> Dict[str, Any]:
         # ON24 API: itemsPerPage default 100, example 25; min 10 per docs
         items_per_page = max(10, items_per_page)
         url = self.BASE_URL.format(client_id=self.client_id)
@@ -31,23 +317,13 @@ class ON24Client:
             params["startDate"] = start_date
         if end_date:
             params["endDate"] = end_date
-        MAX_RETRIES = 5
-        backoff = 2
-        for attempt in range(MAX_RETRIES):
-            response = requests.get(url, headers=self.get_headers(), params=params)
-            if response.status_code == 429:
-                logging.warning(f"429 Too Many Requests for events (attempt {attempt+1}), backing off {backoff} seconds.")
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            if response.status_code == 400:
-                logging.error(f"[ON24Client] 400 Bad Request: {response.text}")
-            response.raise_for_status()
-            return response.json()
-        raise Exception("Max retries exceeded for events endpoint due to throttling.")
-    
-    def get_attendees(self, event_id: int, items_per_page: int = 100, page_offset: int = 0) -> Dict[str, Any]:
-        import time, logging
+        if date_filter_mode:
+            # "creation" (API default) or "updated"
+            params["dateFilterMode"] = date_filter_mode
+        return self._request(url, params, f"events (page {page_offset})", "events")
+
+    def get_attendees(self, event_id: int, items_per_page: int = 100, page_offset: int = 0,
+                      stream: bool = False) -> Dict[str, Any]:
         items_per_page = max(10, items_per_page)
         url = f"{self.BASE_URL.format(client_id=self.client_id)}/{event_id}/attendee"
         params = {
@@ -56,27 +332,11 @@ class ON24Client:
         }
         # log the call
         logging.info(f"[ON24Client] Preparing to request attendees: event_id={event_id}, items_per_page={items_per_page}, page_offset={page_offset}")
-        MAX_RETRIES = 5
-        backoff = 2
-        for attempt in range(MAX_RETRIES):
-            response = requests.get(url, headers=self.get_headers(), params=params)
-            if response.status_code == 429:
-                logging.warning(f"429 Too Many Requests for attendees (event {event_id}, page {page_offset}, attempt {attempt+1}), backing off {backoff} seconds.")
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            if response.status_code == 400:
-                logging.error(f"[ON24Client] 400 Bad Request (attendees): {response.text}")
-            response.raise_for_status()
-            try:
-                return response.json()
-            except Exception as e:
-                logging.error(f"[ON24Client] Failed to parse JSON response: {e}")
-                raise
-        raise Exception(f"Max retries exceeded for attendees endpoint (event {event_id}) due to throttling.")
-
-    def get_registrants(self, event_id: int, items_per_page: int = 100, page_offset: int = 0) -> Dict[str, Any]:
-        import time, logging
+        return self._request(url, params, f"attendees (event {event_id}, page {page_offset})", "attendees",
+                             stream_key="attendees" if stream else None)
+
+    def get_registrants(self, event_id: int, items_per_page: int = 100, page_offset: int = 0,
+                        stream: bool = False) -> Dict[str, Any]:
         items_per_page = max(10, items_per_page)
         url = f"{self.BASE_URL.format(client_id=self.client_id)}/{event_id}/registrant"
         params = {
@@ -85,21 +345,5 @@ class ON24Client:
         }
         # log the call
         logging.info(f"[ON24Client] Preparing to request registrant: event_id={event_id}, items_per_page={items_per_page}, page_offset={page_offset}")
-        MAX_RETRIES = 5
-        backoff = 2
-        for attempt in range(MAX_RETRIES):
-            response = requests.get(url, headers=self.get_headers(), params=params)
-            if response.status_code == 429:
-                logging.warning(f"429 Too Many Requests for registrant (event {event_id}, page {page_offset}, attempt {attempt+1}), backing off {backoff} seconds.")
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            if response.status_code == 400:
-                logging.error(f"[ON24Client] 400 Bad Request (registrants): {response.text}")
-            response.raise_for_status()
-            try:
-                return response.json()
-            except Exception as e:
-                logging.error(f"[ON24Client] Failed to parse JSON response: {e}")
-                raise
-        raise Exception(f"Max retries exceeded for registrant endpoint (event {event_id}) due to throttling.")
+        return self._request(url, params, f"registrants (event {event_id}, page {page_offset})", "registrants",
+                             stream_key="registrants" if stream else None)
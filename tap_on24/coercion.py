@@ -0,0 +1,94 @@
+"""Type coercion compiled once from a stream's JSON schema."""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+
+class ObjectPlan(NamedTuple):
+    """What to coerce inside one JSON object, by key."""
+    integers: Tuple[str, ...]
+    integer_arrays: Tuple[str, ...]
+    objects: Tuple[Tuple[str, "ObjectPlan"], ...]
+    object_arrays: Tuple[Tuple[str, "ObjectPlan"], ...]
+
+
+def schema_types(schema: Dict[str, Any]) -> Tuple[str, ...]:
+    """A JSON schema's `type`, always as a tuple ("integer" -> ("integer",))."""
+    types = schema.get("type", ())
+    return (types,) if isinstance(types, str) else tuple(types)
+
+
+def compile_plan(schema: Dict[str, Any]) -> ObjectPlan:
+    """Walk an object schema once and record which paths hold integers.
+
+    Arrays of strings (pollanswers, surveyanswers, ...) and other non-integer
+    leaves are not part of the plan, so they are never visited at runtime.
+    """
+    integers, integer_arrays, objects, object_arrays = [], [], [], []
+    for key, prop in (schema.get("properties") or {}).items():
+        types = schema_types(prop)
+        if "integer" in types:
+            integers.append(key)
+        elif "object" in types:
+            sub_plan = compile_plan(prop)
+            if any(sub_plan):
+                objects.append((key, sub_plan))
+        elif "array" in types:
+            items = prop.get("items") or {}
+            item_types = schema_types(items)
+            if "integer" in item_types:
+                integer_arrays.append(key)
+            elif "object" in item_types:
+                sub_plan = compile_plan(items)
+                if any(sub_plan):
+                    object_arrays.append((key, sub_plan))
+    return ObjectPlan(tuple(integers), tuple(integer_arrays), tuple(objects), tuple(object_arrays))
+
+
+def _to_int(value: Any) -> Any:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _apply(obj: Dict[str, Any], plan: ObjectPlan) -> None:
+    for key in plan.integers:
+        value = obj.get(key)
+        if value is not None and type(value) is not int:
+            obj[key] = _to_int(value)
+    for key in plan.integer_arrays:
+        values = obj.get(key)
+        if isinstance(values, list):
+            obj[key] = [v if v is None or type(v) is int else _to_int(v) for v in values]
+    for key, sub_plan in plan.objects:
+        value = obj.get(key)
+        if isinstance(value, dict):
+            _apply(value, sub_plan)
+    for key, sub_plan in plan.object_arrays:
+        values = obj.get(key)
+        if isinstance(values, list):
+            for item in values:
+                if isinstance(item, dict):
+                    _apply(item, sub_plan)
+
+
+class RecordCoercer:
+    """Coerce records in place to the integer fields declared by a schema.
+
+    Built once per stream; unparseable integers become None, like the old
+    per-record cast_ids walk did.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.plan = compile_plan(schema)
+
+    def __call__(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        _apply(record, self.plan)
+        return record
+
+    def coerce_page(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        plan = self.plan
+        records = list(records)
+        for record in records:
+            _apply(record, plan)
+        return records
@@ -0,0 +1,59 @@
+"""Run-scoped index of ON24 events shared by the child streams."""
+
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+
+class IndexedEvent(NamedTuple):
+    """Compact view of an event: just what the child streams need."""
+    lastupdated: Optional[str]
+    totalattendees: Optional[int]
+    totalregistrants: Optional[int]
+    istestevent: Optional[bool]
+    client_id: Optional[str] = None
+
+
+class EventIndex:
+    """eventid -> IndexedEvent table filled by the first pass over /event.
+
+    The events endpoint is paged once per run; attendees and registrants
+    read from this table instead of paging through every date window again.
+    """
+
+    def __init__(self):
+        self._events: Dict[int, IndexedEvent] = {}
+        self.complete = False
+
+    def reset(self) -> None:
+        self._events.clear()
+        self.complete = False
+
+    def add(self, event: Dict[str, Any], client_id: Optional[str] = None) -> None:
+        eventid = event.get("eventid")
+        if eventid is None:
+            return
+        analytics = event.get("eventanalytics") or {}
+        self._events[int(eventid)] = IndexedEvent(
+            event.get("lastupdated"),
+            analytics.get("totalattendees"),
+            analytics.get("totalregistrants"),
+            event.get("istestevent"),
+            client_id,
+        )
+
+    def put(self, eventid: int, indexed_event: IndexedEvent) -> None:
+        self._events[eventid] = indexed_event
+
+    def mark_complete(self) -> None:
+        self.complete = True
+
+    def get(self, eventid: int) -> Optional[IndexedEvent]:
+        return self._events.get(eventid)
+
+    def __contains__(self, eventid: int) -> bool:
+        return eventid in self._events
+
+    def items(self) -> Iterator[Tuple[int, IndexedEvent]]:
+        return iter(list(self._events.items()))
+
+    def __len__(self) -> int:
+        return len(self._events)
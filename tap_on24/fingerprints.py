@@ -0,0 +1,143 @@
+"""Local store of record hashes, used to skip re-emitting unchanged attendees/registrants."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import uuid4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    stream TEXT NOT NULL,
+    eventid INTEGER NOT NULL,
+    userid INTEGER NOT NULL,
+    hash BLOB NOT NULL,
+    PRIMARY KEY (stream, eventid, userid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    stream TEXT NOT NULL,
+    eventid INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    last_seen INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (stream, eventid)
+) WITHOUT ROWID;
+"""
+
+
+def fingerprint(record: Dict[str, Any]) -> bytes:
+    """Stable 8-byte hash of a record: key order and the JSON library in use don't matter."""
+    raw = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=8).digest()
+
+
+class FingerprintStore:
+    """SQLite table of (stream, eventid, userid) -> hash of the record last emitted.
+
+    Hashes of one event are written together, under this run's `token`, which the
+    stream also saves in the event's bookmark. They are only trusted while the two match, i.e.
+    once the target has confirmed the STATE that followed those records: if a run
+    dies before that, the next run re-emits the event in full rather than losing rows.
+
+    Events not seen for `retention_days` are dropped by `compact()`, which also drops
+    the least recently seen events while the file exceeds `max_bytes`, then vacuums.
+    """
+
+    def __init__(self, path: str, retention_days: Optional[float] = 90, max_bytes: Optional[int] = None):
+        self.path = path
+        self.retention_days = retention_days if retention_days and retention_days > 0 else None
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self.lock = threading.Lock()
+        self.token = uuid4().hex[:16]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def load(self, stream: str, eventid: int, token: Optional[str]) -> Dict[int, bytes]:
+        """userid -> hash for one event, or {} unless the hashes were written under `token`."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT token FROM events WHERE stream = ? AND eventid = ?", (stream, eventid)
+            ).fetchone()
+            if row is None or token is None or row[0] != token:
+                return {}
+            return dict(self.connection.execute(
+                "SELECT userid, hash FROM fingerprints WHERE stream = ? AND eventid = ?", (stream, eventid)
+            ))
+
+    def save(self, stream: str, eventid: int, hashes: Dict[int, bytes], complete: bool = True) -> None:
+        """Store an event's hashes under this run's token; with `complete`, forget users not in `hashes`."""
+        with self.lock, self.connection:
+            if complete:
+                self.connection.execute("DELETE FROM fingerprints WHERE stream = ? AND eventid = ?", (stream, eventid))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints (stream, eventid, userid, hash) VALUES (?, ?, ?, ?)",
+                ((stream, eventid, userid, value) for userid, value in hashes.items()),
+            )
+            rows = self.connection.execute(
+                "SELECT COUNT(*) FROM fingerprints WHERE stream = ? AND eventid = ?", (stream, eventid)
+            ).fetchone()[0]
+            self.connection.execute(
+                "INSERT OR REPLACE INTO events (stream, eventid, token, last_seen, rows) VALUES (?, ?, ?, ?, ?)",
+                (stream, eventid, self.token, int(time.time()), rows),
+            )
+
+    def _size(self) -> int:
+        page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        free = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def size(self) -> int:
+        """Bytes in use by the database, excluding free pages."""
+        with self.lock:
+            return self._size()
+
+    def _drop(self, events: Iterable[Tuple[str, int]]) -> int:
+        events = list(events)
+        with self.connection:
+            for stream, eventid in events:
+                self.connection.execute("DELETE FROM fingerprints WHERE stream = ? AND eventid = ?", (stream, eventid))
+                self.connection.execute("DELETE FROM events WHERE stream = ? AND eventid = ?", (stream, eventid))
+        return len(events)
+
+    def compact(self) -> None:
+        """Apply retention and the size cap, then give freed pages back to the filesystem."""
+        with self.lock:
+            dropped = 0
+            if self.retention_days is not None:
+                cutoff = int(time.time() - self.retention_days * 86400)
+                dropped += self._drop(self.connection.execute(
+                    "SELECT stream, eventid FROM events WHERE last_seen < ?", (cutoff,)
+                ).fetchall())
+            size = self._size()
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Drop least recently seen events until their estimated share of the file is freed
+                total_rows = self.connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0] or 1
+                bytes_per_row = size / total_rows
+                excess = size - self.max_bytes
+                oldest = []
+                for stream, eventid, rows in self.connection.execute(
+                    "SELECT stream, eventid, rows FROM events ORDER BY last_seen"
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    oldest.append((stream, eventid))
+                    excess -= rows * bytes_per_row
+                dropped += self._drop(oldest)
+            free = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+            if free > pages // 4:
+                self.connection.execute("VACUUM")
+        if dropped:
+            logging.info(f"[FingerprintStore] Dropped fingerprints of {dropped} events from {self.path}.")
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
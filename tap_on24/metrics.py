@@ -0,0 +1,211 @@
+"""Run-wide counters and histograms: per endpoint, per stream and per sync stage."""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from singer_sdk import metrics as sdk_metrics
+
+# Seconds: fine below one second (parse/cast), coarse above (network, backoff)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+PAGE_SIZE_BUCKETS = (10, 25, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+Tags = Tuple[Tuple[str, str], ...]
+
+
+class ON24Metric(str, Enum):
+    """Metric names, in the style of singer_sdk.metrics.Metric."""
+    HTTP_REQUEST_COUNT = "http_request_count"
+    HTTP_REQUEST_DURATION = "http_request_duration"
+    HTTP_RESPONSE_BYTES = "http_response_bytes"
+    HTTP_THROTTLED_COUNT = "http_throttled_count"
+    HTTP_CACHE_COUNT = "http_cache_count"
+    RETRY_SLEEP_DURATION = "retry_sleep_duration"
+    RATE_LIMIT_WAIT_DURATION = "rate_limit_wait_duration"
+    PAGES_PER_EVENT = "pages_per_event"
+    STAGE_DURATION = "stage_duration"
+    RECORD_COUNT = "record_count"
+    UNCHANGED_RECORD_COUNT = "unchanged_record_count"
+    STREAM_DURATION = "stream_duration"
+    RECORDS_PER_SECOND = "records_per_second"
+    PAGE_SIZE = "page_size"
+    PAGE_SIZE_CURRENT = "page_size_current"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as in the Prometheus exposition format."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+        }
+
+
+def _tags(tags: Dict[str, Any]) -> Tags:
+    return tuple(sorted((key, str(value)) for key, value in tags.items() if value is not None))
+
+
+class RunMetrics:
+    """Thread-safe registry shared by the tap's clients and streams for one run.
+
+    Everything is summed over the run and reported once at the end: as SDK
+    metric log lines, and optionally as a Prometheus textfile and/or JSON summary.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[Tuple[ON24Metric, Tags], float] = {}
+        self.histograms: Dict[Tuple[ON24Metric, Tags], Histogram] = {}
+        self.gauges: Dict[Tuple[ON24Metric, Tags], float] = {}
+
+    def increment(self, metric: ON24Metric, value: float = 1, **tags: Any) -> None:
+        key = (metric, _tags(tags))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, metric: ON24Metric, value: float, **tags: Any) -> None:
+        with self.lock:
+            self.gauges[(metric, _tags(tags))] = value
+
+    def observe(self, metric: ON24Metric, value: float, buckets: Tuple[float, ...] = DURATION_BUCKETS,
+                **tags: Any) -> None:
+        key = (metric, _tags(tags))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, metric: ON24Metric, **tags: Any) -> Iterator[None]:
+        """Observe the wall time of the block, even if it raises or a generator is closed."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - started, **tags)
+
+    def stage(self, stage: str, seconds: float, **tags: Any) -> None:
+        """Add time spent in one sync stage (network, parse, cast, emit)."""
+        self.increment(ON24Metric.STAGE_DURATION, seconds, stage=stage, **tags)
+
+    def total(self, metric: ON24Metric, **tags: Any) -> float:
+        """Sum of a counter over every tag set that includes `tags`."""
+        wanted = set(_tags(tags))
+        with self.lock:
+            return sum(value for (name, key_tags), value in self.counters.items()
+                       if name == metric and wanted <= set(key_tags))
+
+    def records_per_second(self) -> Dict[str, float]:
+        """Records per second of stream wall time, per stream."""
+        with self.lock:
+            records = {dict(tags).get("stream"): value for (metric, tags), value in self.counters.items()
+                       if metric == ON24Metric.RECORD_COUNT}
+            seconds = {dict(tags).get("stream"): histogram.sum for (metric, tags), histogram in self.histograms.items()
+                       if metric == ON24Metric.STREAM_DURATION}
+        return {stream: round(count / seconds[stream], 1) for stream, count in records.items() if seconds.get(stream)}
+
+    def summary(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Counters, gauges (records/sec, final page sizes, ...) and histograms as plain dicts."""
+        with self.lock:
+            gauges = [{"metric": metric.value, "tags": dict(tags), "value": value}
+                      for (metric, tags), value in sorted(self.gauges.items())]
+            counters = [{"metric": metric.value, "tags": dict(tags), "value": round(value, 6)}
+                        for (metric, tags), value in sorted(self.counters.items())]
+            histograms = [{"metric": metric.value, "tags": dict(tags), **histogram.summary()}
+                          for (metric, tags), histogram in sorted(self.histograms.items())]
+        gauges += [{"metric": ON24Metric.RECORDS_PER_SECOND.value, "tags": {"stream": stream}, "value": value}
+                   for stream, value in sorted(self.records_per_second().items())]
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def log(self, logger: Optional[logging.Logger] = None) -> None:
+        """Emit the run totals as SDK `METRIC:` log lines."""
+        logger = logger or sdk_metrics.get_metrics_logger()
+        summary = self.summary()
+        for metric_type in ("counter", "gauge"):
+            for item in summary[metric_type + "s"]:
+                sdk_metrics.log(logger, sdk_metrics.Point(metric_type, ON24Metric(item["metric"]), item["value"], item["tags"]))
+        for item in summary["histograms"]:
+            value = {key: item[key] for key in ("count", "sum", "min", "max", "mean")}
+            sdk_metrics.log(logger, sdk_metrics.Point("histogram", ON24Metric(item["metric"]), value, item["tags"]))
+
+    def to_prometheus(self, prefix: str = "tap_on24_") -> str:
+        """The run totals in the Prometheus text exposition format."""
+        def labels(tags: Tags, extra: Tags = ()) -> str:
+            pairs = tags + extra
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+        lines: List[str] = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            gauges = sorted(self.gauges.items())
+        typed = set()
+        for (metric, tags), value in counters:
+            name = prefix + metric.value + "_total"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{labels(tags)} {value}")
+        for (metric, tags), histogram in histograms:
+            name = prefix + metric.value
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{labels(tags, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{labels(tags)} {histogram.sum}")
+            lines.append(f"{name}_count{labels(tags)} {histogram.count}")
+        for (metric, tags), value in gauges:
+            name = prefix + metric.value
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{labels(tags)} {value}")
+        name = prefix + ON24Metric.RECORDS_PER_SECOND.value
+        lines.append(f"# TYPE {name} gauge")
+        for stream, value in sorted(self.records_per_second().items()):
+            lines.append(f"{name}{labels((('stream', stream),))} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, prometheus_path: Optional[str] = None, json_path: Optional[str] = None) -> None:
+        """Write the Prometheus textfile and/or JSON summary, each replaced atomically."""
+        for path, render in ((prometheus_path, self.to_prometheus),
+                             (json_path, lambda: json.dumps(self.summary(), indent=2) + "\n")):
+            if not path:
+                continue
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(render())
+            os.replace(tmp_path, path)
@@ -0,0 +1,81 @@
+"""Per-endpoint page sizes that adapt to observed latency, payload size and errors."""
+
+import logging
+import threading
+from typing import Optional
+
+# ON24 API minimum for itemsPerPage
+MIN_ITEMS_PER_PAGE = 10
+
+
+class PageSizer:
+    """itemsPerPage for one endpoint, shared by every client and worker using it.
+
+    Each fetched page updates moving averages of seconds and bytes per record and
+    of the transient error rate. The next size aims for pages of about
+    `target_seconds` and at most `max_page_bytes`, moves by at most a factor of
+    two per page and stays within [minimum, maximum]. Sizes only grow after a full
+    page, since a short last page says nothing about larger ones, and halve while
+    more than `max_error_rate` of recent pages needed a retry (5xx, timeouts).
+
+    With `adaptive` off, `size` is always `initial`.
+    """
+
+    ALPHA = 0.3
+
+    def __init__(self, endpoint: str, initial: int, adaptive: bool = True,
+                 minimum: int = MIN_ITEMS_PER_PAGE, maximum: int = 1000,
+                 target_seconds: float = 2.0, max_page_bytes: Optional[int] = 5 * 1024 * 1024,
+                 max_error_rate: float = 0.1):
+        self.endpoint = endpoint
+        self.minimum = max(MIN_ITEMS_PER_PAGE, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.initial = min(self.maximum, max(self.minimum, initial))
+        self.adaptive = adaptive
+        self.target_seconds = target_seconds
+        self.max_page_bytes = max_page_bytes if max_page_bytes and max_page_bytes > 0 else None
+        self.max_error_rate = max_error_rate
+        self.lock = threading.Lock()
+        self._size = self.initial
+        self.seconds_per_record: Optional[float] = None
+        self.bytes_per_record: Optional[float] = None
+        self.error_rate = 0.0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _average(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.ALPHA * (value - current)
+
+    def observe(self, items_per_page: int, records: int, seconds: float, nbytes: int, errors: int = 0) -> None:
+        """Account for one page fetched with `items_per_page`."""
+        if not self.adaptive:
+            return
+        with self.lock:
+            self.error_rate = self._average(self.error_rate, 1.0 if errors else 0.0)
+            if records > 0:
+                self.seconds_per_record = self._average(self.seconds_per_record, seconds / records)
+                self.bytes_per_record = self._average(self.bytes_per_record, nbytes / records)
+            size = self._size
+            if self.error_rate > self.max_error_rate:
+                target = size // 2
+            elif self.seconds_per_record is None:
+                return
+            else:
+                target = self.target_seconds / max(self.seconds_per_record, 1e-6)
+                if self.max_page_bytes is not None and self.bytes_per_record:
+                    target = min(target, self.max_page_bytes / self.bytes_per_record)
+                if target > size and records < items_per_page:
+                    target = size
+            if size * 0.75 <= target <= size * 1.25:
+                # Close enough: don't churn the size on noise
+                return
+            target = int(min(size * 2, max(size // 2, target)))
+            # Round to a multiple of ten so sizes stay readable and stable
+            target = min(self.maximum, max(self.minimum, target - target % 10 or self.minimum))
+            if target != size:
+                logging.info(f"[PageSizer] {self.endpoint}: itemsPerPage {size} -> {target} "
+                             f"({self.seconds_per_record or 0:.4f} s/record, "
+                             f"{self.bytes_per_record or 0:.0f} bytes/record, error rate {self.error_rate:.2f}).")
+                self._size = target
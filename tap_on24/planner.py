@@ -0,0 +1,119 @@
+"""Dry-run sync plans (`--plan`) and the work manifests later runs consume."""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from tap_on24.event_index import EventIndex, IndexedEvent
+from tap_on24.metrics import ON24Metric
+
+MANIFEST_VERSION = 1
+
+# Assumed seconds per request when the events pass made none to measure
+DEFAULT_REQUEST_SECONDS = 1.0
+
+
+def _pages(total: Optional[int], items_per_page: int, start_page: int = 0) -> int:
+    """Requests get_event_pages makes for an event of `total` records (at least one if unknown)."""
+    if total is None:
+        return 1
+    return max(0, -(-int(total) // items_per_page) - start_page)
+
+
+def build_plan(tap) -> Dict[str, Any]:
+    """Page through /event only, then count the child pages the sync would request.
+
+    Child page counts are exact for events whose eventanalytics report a total, at
+    the page size in effect when they start (adaptive sizing can only make a real
+    run cheaper). Events without a total count as one page and are listed as
+    `unknown_totals`. Bookmarks and a resumable checkpoint in the state are honoured,
+    as in a real run. The estimate assumes child requests take as long as /event
+    requests did, spread over `max_workers`, and never faster than
+    `requests_per_second` allows per client.
+    """
+    metrics = tap.metrics
+    started = time.perf_counter()
+    index = tap.get_event_index()
+    events_seconds = time.perf_counter() - started
+    events_requests = int(metrics.total(ON24Metric.HTTP_REQUEST_COUNT, endpoint="events"))
+    network_seconds = metrics.total(ON24Metric.STAGE_DURATION, stage="network", stream="events")
+    request_seconds = network_seconds / events_requests if events_requests else DEFAULT_REQUEST_SECONDS
+    workers = max(1, int(tap.config.get("max_workers") or 1))
+    rate = tap.config.get("requests_per_second")
+
+    plan: Dict[str, Any] = {
+        "version": MANIFEST_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "on24_start_date": tap.config.get("on24_start_date"),
+        "on24_end_date": tap.config.get("on24_end_date"),
+        "items_per_page": int(tap.config.get("items_per_page") or 100),
+        "index": [dict(indexed_event._asdict(), eventid=eventid) for eventid, indexed_event in index.items()],
+        "streams": {
+            "events": {"events": len(index), "requests": events_requests, "seconds": round(events_seconds, 1)},
+        },
+    }
+    total_requests = events_requests
+    estimated_seconds = events_seconds
+    for stream in tap.streams.values():
+        if not hasattr(stream, "plan_events") or not stream.selected:
+            continue
+        items_per_page = stream.page_size()
+        work: List[Dict[str, Any]] = []
+        unknown = 0
+        per_client: Dict[Optional[str], int] = {}
+        for eventid, indexed_event in stream.plan_events():
+            total = getattr(indexed_event, stream.total_key)
+            start_page = stream._resume_page(eventid, items_per_page)
+            pages = _pages(total, items_per_page, start_page)
+            unknown += total is None
+            client_id = indexed_event.client_id or next(iter(tap.clients))
+            per_client[client_id] = per_client.get(client_id, 0) + pages
+            work.append({"eventid": eventid, "total": total, "start_page": start_page, "pages": pages})
+        requests = sum(item["pages"] for item in work)
+        seconds = requests * request_seconds / workers
+        if rate:
+            # The rate limit is per client: the busiest client sets the pace
+            seconds = max(seconds, max(per_client.values(), default=0) / float(rate))
+        plan["streams"][stream.name] = {
+            "events": len(work),
+            "items_per_page": items_per_page,
+            "requests": requests,
+            "unknown_totals": unknown,
+            "seconds": round(seconds, 1),
+            "work": work,
+        }
+        total_requests += requests
+        estimated_seconds += seconds
+    plan["requests"] = total_requests
+    plan["estimated_seconds"] = round(estimated_seconds, 1)
+    return plan
+
+
+def log_plan(plan: Dict[str, Any], logger) -> None:
+    """One summary line per stream, then the totals."""
+    for name, stream_plan in plan["streams"].items():
+        unknown = stream_plan.get("unknown_totals")
+        logger.info(
+            f"Plan: {name}: {stream_plan['events']} events, {stream_plan['requests']} requests"
+            + (f" at {stream_plan['items_per_page']} per page" if "items_per_page" in stream_plan else "")
+            + (f" ({unknown} events without a known total counted as one page)" if unknown else "")
+            + f", ~{stream_plan['seconds']:.0f}s."
+        )
+    logger.info(f"Plan: {plan['requests']} requests in total, estimated {plan['estimated_seconds']:.0f}s.")
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a plan written by `--plan`, for use as a work manifest."""
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise Exception(f"Unsupported work manifest version in {path}: {manifest.get('version')!r}.")
+    return manifest
+
+
+def seed_index(index: EventIndex, manifest: Dict[str, Any]) -> None:
+    """Fill the event index from a manifest instead of paging /event."""
+    index.reset()
+    for item in manifest.get("index") or []:
+        index.put(int(item["eventid"]), IndexedEvent(*(item.get(field) for field in IndexedEvent._fields)))
+    index.mark_complete()
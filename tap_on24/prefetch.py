@@ -0,0 +1,81 @@
+"""Bounded read-ahead for paginated ON24 endpoints."""
+
+import queue
+import threading
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class ReadAhead(Generic[T]):
+    """Iterate `pages` in a background thread, started right away, keeping up to `depth` pages ready.
+
+    At most `depth` pages wait in the buffer (plus the one the producer holds while
+    it waits for room), which bounds memory. Exceptions raised while fetching are
+    re-raised on the consuming side. `close()` lets the producer exit at its next put,
+    whether or not anything was consumed.
+    """
+
+    def __init__(self, pages: Iterable[T], depth: int):
+        self._pages = pages
+        self._buffer: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._produce, name="on24-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for page in self._pages:
+                if not self._put((True, page)):
+                    return
+            self._put((True, _END))
+        except BaseException as e:
+            self._put((False, e))
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self._done:
+            raise StopIteration
+        ok, page = self._buffer.get()
+        if not ok:
+            self.close()
+            raise page
+        if page is _END:
+            self.close()
+            raise StopIteration
+        return page
+
+    def close(self) -> None:
+        self._done = True
+        self._stop.set()
+
+
+def prefetch(pages: Iterable[T], depth: int) -> Iterator[T]:
+    """Iterate `pages` in a background thread, keeping up to `depth` pages ready.
+
+    While the caller processes page N, the producer is already requesting page
+    N+1. A depth of 0 disables read-ahead.
+    """
+    if depth <= 0:
+        yield from pages
+        return
+    reader = ReadAhead(pages, depth)
+    try:
+        yield from reader
+    finally:
+        # Consumer finished or abandoned us: let the producer exit at its next put
+        reader.close()
@@ -0,0 +1,169 @@
+"""Per-stream profiles of a sync: a stack sampler (default) or cProfile."""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+PROFILE_MODES = ("sample", "cprofile")
+
+Frame = Tuple[str, int, str]
+
+
+def _label(frame: Frame) -> str:
+    filename, lineno, name = frame
+    return f"{name} ({filename}:{lineno})"
+
+
+class StackSampler:
+    """Samples the stack of every thread each `interval` seconds from a background thread.
+
+    Overhead is one stack walk per thread per sample, independent of how hot the code
+    is, and worker threads (prefetch, thread pools, the asyncio loop) are covered too.
+    Time blocked on sockets or queues shows up as samples in those calls.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start (or resume) sampling; samples add up across start/stop cycles."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="on24-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.append(("<thread>", 0, names.get(ident, str(ident))))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, path: str) -> None:
+        """Collapsed stacks ("frame;frame;frame count"), for flamegraph.pl or speedscope."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(name if filename == "<thread>" else _label((filename, lineno, name))
+                                 for filename, lineno, name in stack) + f" {count}\n")
+
+    def summary(self, top_n: int) -> str:
+        """Samples per thread, then the top functions by self samples (on top of a stack) and total samples (anywhere in it)."""
+        threads: Counter = Counter()
+        own: Counter = Counter()
+        total: Counter = Counter()
+        stack_samples = sum(self.stacks.values()) or 1
+        for stack, count in self.stacks.items():
+            threads[stack[0][2]] += count
+            own[stack[-1]] += count
+            for frame in set(stack[1:]):
+                total[frame] += count
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms, {stack_samples} thread stacks", "",
+                 "Samples per thread:"]
+        lines += [f"{100 * count / stack_samples:6.1f}% {count:8d}  {name}" for name, count in threads.most_common()]
+        for title, counts in (("self", own), ("total", total)):
+            lines += ["", f"Top {top_n} functions by {title} samples:"]
+            for frame, count in counts.most_common(top_n):
+                lines.append(f"{100 * count / stack_samples:6.1f}% {count:8d}  {_label(frame)}")
+        return "\n".join(lines) + "\n"
+
+
+class RunProfiler:
+    """Profiles each stream's get_records into `directory`/<run start>/.
+
+    Per stream: `<stream>.folded` (mode "sample") or `<stream>.prof` (mode "cprofile",
+    for pstats/snakeviz), and `<stream>.txt` with the top `top_n` functions. cProfile
+    only sees the thread that emits records; the sampler sees all threads.
+    A stream synced while another is being profiled (e.g. events paged on demand by a
+    child stream) is counted in the outer stream's profile. A stream's profile adds
+    up all its get_records calls (one per partition in partitioned mode) and is
+    written by `write()` at the end of the run.
+    """
+
+    def __init__(self, directory: str, mode: str = "sample", interval: float = 0.005, top_n: int = 30):
+        if mode not in PROFILE_MODES:
+            raise Exception(f"profile_mode must be one of {PROFILE_MODES}, got {mode!r}.")
+        self.directory = os.path.join(directory, time.strftime("%Y%m%dT%H%M%S"))
+        self.mode = mode
+        self.interval = interval
+        self.top_n = top_n
+        self.active: Optional[str] = None
+        self.profilers: Dict[str, Any] = {}
+        self.seconds: Dict[str, float] = {}
+        self.paths: Dict[str, str] = {}
+
+    @contextmanager
+    def stream(self, name: str) -> Iterator[None]:
+        """Profile the block as stream `name`, unless another stream's profile is running."""
+        if self.active is not None:
+            yield
+            return
+        self.active = name
+        profiler = self.profilers.get(name)
+        if profiler is None:
+            profiler = self.profilers[name] = cProfile.Profile() if self.mode == "cprofile" else StackSampler(self.interval)
+        if self.mode == "cprofile":
+            profiler.enable()
+        else:
+            profiler.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            self.active = None
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def write(self) -> None:
+        """Write every stream's profile and summary."""
+        for name, profiler in self.profilers.items():
+            try:
+                self._write(name, profiler, self.seconds.get(name, 0.0))
+            except OSError as e:
+                logging.warning(f"[RunProfiler] Could not write the {name} profile: {e}")
+
+    def _write(self, name: str, profiler, seconds: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, name)
+        header = f"Profile of stream {name}: {seconds:.1f}s ({self.mode})\n"
+        if self.mode == "cprofile":
+            profiler.dump_stats(base + ".prof")
+            out = io.StringIO()
+            stats = pstats.Stats(profiler, stream=out).strip_dirs()
+            stats.sort_stats("tottime").print_stats(self.top_n)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            summary = out.getvalue()
+        else:
+            profiler.write_folded(base + ".folded")
+            summary = profiler.summary(self.top_n)
+        with open(base + ".txt", "w") as f:
+            f.write(header + "\n" + summary)
+        self.paths[name] = base + ".txt"
+        logging.info(f"[RunProfiler] {header.strip()}; summary in {base}.txt")
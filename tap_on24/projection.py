@@ -0,0 +1,73 @@
+"""Catalog selection compiled into a projection applied as pages are decoded."""
+
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from tap_on24.coercion import schema_types
+
+Breadcrumb = Tuple[str, ...]
+
+
+class ProjectionPlan(NamedTuple):
+    """What to drop inside one JSON object, by key."""
+    drop: Tuple[str, ...]
+    objects: Tuple[Tuple[str, "ProjectionPlan"], ...]
+    object_arrays: Tuple[Tuple[str, "ProjectionPlan"], ...]
+
+
+def compile_projection(schema: Dict[str, Any], mask: Mapping[Breadcrumb, bool],
+                       keep: Iterable[str] = (), breadcrumb: Breadcrumb = ()) -> Optional[ProjectionPlan]:
+    """Walk an object schema once and record the deselected properties; None if nothing is.
+
+    Only breadcrumbs the catalog actually lists are consulted, so a nested property is
+    dropped only when explicitly deselected (its parent being selected). Array items are
+    addressed as `(..., "properties", name, "items", "properties", child)`. Root keys in
+    `keep` are never dropped.
+    """
+    keep = set(keep)
+    drop, objects, object_arrays = [], [], []
+    for key, prop in (schema.get("properties") or {}).items():
+        key_breadcrumb = breadcrumb + ("properties", key)
+        if key_breadcrumb in mask and not mask[key_breadcrumb] and key not in keep:
+            drop.append(key)
+            continue
+        types = schema_types(prop)
+        if "object" in types:
+            sub_plan = compile_projection(prop, mask, breadcrumb=key_breadcrumb)
+            if sub_plan is not None:
+                objects.append((key, sub_plan))
+        elif "array" in types and "object" in schema_types(prop.get("items") or {}):
+            sub_plan = compile_projection(prop["items"], mask, breadcrumb=key_breadcrumb + ("items",))
+            if sub_plan is not None:
+                object_arrays.append((key, sub_plan))
+    if not (drop or objects or object_arrays):
+        return None
+    return ProjectionPlan(tuple(drop), tuple(objects), tuple(object_arrays))
+
+
+def project_schema(schema: Dict[str, Any], plan: Optional[ProjectionPlan]) -> Dict[str, Any]:
+    """A copy of `schema` without the properties `plan` drops."""
+    if plan is None:
+        return schema
+    properties = {key: prop for key, prop in (schema.get("properties") or {}).items() if key not in plan.drop}
+    for key, sub_plan in plan.objects:
+        properties[key] = project_schema(properties[key], sub_plan)
+    for key, sub_plan in plan.object_arrays:
+        properties[key] = dict(properties[key], items=project_schema(properties[key]["items"], sub_plan))
+    return dict(schema, properties=properties)
+
+
+def project(obj: Dict[str, Any], plan: ProjectionPlan) -> Dict[str, Any]:
+    """Drop deselected subtrees from `obj` in place."""
+    for key in plan.drop:
+        obj.pop(key, None)
+    for key, sub_plan in plan.objects:
+        value = obj.get(key)
+        if isinstance(value, dict):
+            project(value, sub_plan)
+    for key, sub_plan in plan.object_arrays:
+        values = obj.get(key)
+        if isinstance(values, list):
+            for item in values:
+                if isinstance(item, dict):
+                    project(item, sub_plan)
+    return obj
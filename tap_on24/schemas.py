@@ -0,0 +1,435 @@
+"""Stream schemas, built on first use and cached on disk per package version."""
+
+import json
+import logging
+import os
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from singer_sdk import typing as th
+
+# Schemas of this process, by stream name
+_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+
+
+def cache_dir() -> str:
+    """$TAP_ON24_CACHE_DIR, else tap-on24 under $XDG_CACHE_HOME (~/.cache)."""
+    return os.environ.get("TAP_ON24_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "tap-on24"
+    )
+
+
+@lru_cache(maxsize=None)
+def cache_key() -> str:
+    """Package and singer-sdk versions plus a checksum of the package's modules.
+
+    The catalog depends on more than the schemas (stream keys in streams.py, the SDK's
+    metadata), so an edited checkout or another SDK version invalidates too.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+    versions = []
+    for package in ("tap-on24", "singer-sdk"):
+        try:
+            versions.append(version(package))
+        except PackageNotFoundError:
+            versions.append("unknown")
+    checksum = 0
+    package_dir = os.path.dirname(__file__)
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(package_dir, name), "rb") as f:
+                checksum = zlib.crc32(f.read(), checksum)
+    return "-".join(versions) + f"-{checksum:08x}"
+
+
+def cache_path(kind: str) -> str:
+    return os.path.join(cache_dir(), f"{kind}-{cache_key()}.json")
+
+
+def read_cache(kind: str) -> Optional[Any]:
+    """The cached `kind` document for this package version, or None."""
+    try:
+        with open(cache_path(kind)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(kind: str, document: Any) -> None:
+    """Cache `document` for this package version; a cache that can't be written is skipped."""
+    path = cache_path(kind)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(document, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.debug(f"Could not write {path}: {e}")
+
+
+def load_schema(name: str) -> Dict[str, Any]:
+    """The schema of stream `name`: from this process, the disk cache, or built (and cached)."""
+    if not _SCHEMAS:
+        cached = read_cache("schemas")
+        if not isinstance(cached, dict) or set(cached) != set(BUILDERS):
+            cached = {stream: build() for stream, build in BUILDERS.items()}
+            write_cache("schemas", cached)
+        _SCHEMAS.update(cached)
+    return _SCHEMAS[name]
+
+
+class LazySchema:
+    """A stream's `schema` class attribute, loaded on first access and then stored in its place."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __set_name__(self, owner, attribute: str) -> None:
+        self.attribute = attribute
+
+    def __get__(self, instance, owner) -> Dict[str, Any]:
+        schema = load_schema(self.name)
+        setattr(owner, self.attribute, schema)
+        return schema
+
+
+def events_schema() -> Dict[str, Any]:
+    return th.PropertiesList(
+        th.Property("eventid", th.IntegerType),
+        th.Property("clientid", th.IntegerType),
+        th.Property("goodafter", th.StringType),
+        th.Property("isactive", th.BooleanType),
+        th.Property("regrequired", th.BooleanType),
+        th.Property("description", th.StringType),
+        th.Property("promotionalsummary", th.StringType),
+        th.Property("regnotificationrequired", th.BooleanType),
+        th.Property("displaytimezonecd", th.StringType),
+        th.Property("eventtype", th.StringType),
+        th.Property("category", th.StringType),
+        th.Property("createtimestamp", th.StringType),
+        th.Property("localelanguagecd", th.StringType),
+        th.Property("localecountrycd", th.StringType),
+        th.Property("lastmodified", th.StringType),
+        th.Property("lastupdated", th.StringType),
+        th.Property("iseliteexpired", th.StringType),
+        th.Property("application", th.StringType),
+        th.Property("livestart", th.StringType),
+        th.Property("liveend", th.StringType),
+        th.Property("archivestart", th.StringType),
+        th.Property("archiveend", th.StringType),
+        th.Property("audienceurl", th.StringType),
+        th.Property("contenttype", th.StringType),
+        th.Property("campaigncode", th.StringType),
+        th.Property("eventlocation", th.StringType),
+        th.Property("createdby", th.StringType),
+        th.Property("ishybridevent", th.BooleanType),
+        th.Property("istestevent", th.BooleanType),
+        th.Property("eventprofile", th.StringType),
+        th.Property("streamtype", th.StringType),
+        th.Property("audiencekey", th.StringType),
+        th.Property("extaudienceurl", th.StringType),
+        th.Property("reporturl", th.StringType),
+        th.Property("uploadurl", th.StringType),
+        th.Property("pmurl", th.StringType),
+        th.Property("previewurl", th.StringType),
+        th.Property("eventanalytics", th.ObjectType(
+            th.Property("totalregistrants", th.IntegerType),
+            th.Property("totalattendees", th.IntegerType),
+            th.Property("noshowcount", th.IntegerType),
+            th.Property("registrationpagehits", th.IntegerType),
+            th.Property("numberofgetpricingrequests", th.IntegerType),
+            th.Property("numberoffreetrialrequests", th.IntegerType),
+            th.Property("numberofresourcesavailable", th.IntegerType),
+            th.Property("attendeeswhodownloadedresource", th.IntegerType),
+            th.Property("uniqueattendeeresourcedownloads", th.IntegerType),
+            th.Property("numberofmeetingconversions", th.IntegerType),
+            th.Property("numberofdemoconversions", th.IntegerType),
+            th.Property("averagearchiveminutes", th.IntegerType),
+            th.Property("averagecumulativearchiveminutes", th.IntegerType),
+            th.Property("totalcumulativeliveminutes", th.IntegerType),
+            th.Property("totalcumulativearchiveminutes", th.IntegerType),
+            th.Property("totalcumulativeminutes", th.IntegerType),
+            th.Property("totalmediaplayerminutes", th.IntegerType),
+            th.Property("totallivemediaplayerminutes", th.IntegerType),
+            th.Property("totalarchivemediaplayerminutes", th.IntegerType),
+            th.Property("liveattendees", th.IntegerType),
+            th.Property("ondemandattendees", th.IntegerType),
+            th.Property("averageliveminutes", th.IntegerType),
+            th.Property("averagecumulativeliveminutes", th.IntegerType),
+        )),
+        th.Property("scheduledeventduration", th.IntegerType),
+        th.Property("eventstd1", th.StringType),
+        th.Property("eventstd2", th.StringType),
+        th.Property("eventstd3", th.StringType),
+        th.Property("eventstd4", th.StringType),
+        th.Property("eventstd5", th.StringType),
+        th.Property("tags", th.ArrayType(th.StringType)),
+        th.Property("funnelstages", th.ArrayType(th.StringType)),
+        th.Property("speakers", th.ArrayType(th.ObjectType(
+            th.Property("name", th.StringType),
+            th.Property("title", th.StringType),
+            th.Property("company", th.StringType),
+            th.Property("description", th.StringType),
+        ))),
+        th.Property("partnerrefstats", th.ArrayType(th.ObjectType(
+            th.Property("code", th.StringType),
+            th.Property("count", th.IntegerType),
+        ))),
+        th.Property("surveyurls", th.ArrayType(th.StringType)),
+        th.Property("customaccounttags", th.ArrayType(th.ObjectType(
+            th.Property("groupid", th.IntegerType),
+            th.Property("groupname", th.StringType),
+            th.Property("tagid", th.IntegerType),
+            th.Property("tagname", th.StringType),
+        ))),
+        th.Property("customeventfields", th.ArrayType(th.ObjectType(
+            th.Property("name", th.StringType),
+            th.Property("label", th.StringType),
+            th.Property("value", th.StringType),
+        ))),
+        th.Property("media", th.ObjectType(
+            th.Property("audios", th.ArrayType(th.StringType)),
+            th.Property("videos", th.ArrayType(th.StringType)),
+            th.Property("slides", th.ArrayType(th.StringType)),
+            th.Property("videoclips", th.ArrayType(th.StringType)),
+            th.Property("urls", th.ArrayType(th.StringType)),
+            th.Property("polls", th.ArrayType(th.StringType)),
+        )),
+        th.Property("categories", th.ArrayType(th.StringType)),
+        th.Property("tracks", th.ArrayType(th.StringType)),
+        th.Property("livedays", th.ArrayType(th.ObjectType(
+            th.Property("id", th.IntegerType),
+            th.Property("title", th.StringType),
+            th.Property("livestarttime", th.StringType),
+            th.Property("liveendtime", th.StringType),
+        ))),
+        th.Property("contents", th.ArrayType(th.ObjectType(
+            th.Property("title", th.StringType),
+            th.Property("type", th.StringType),
+            th.Property("status", th.StringType),
+            th.Property("resourceid", th.IntegerType),
+            th.Property("externalurl", th.StringType),
+        ))),
+        th.Property("sponsors", th.ArrayType(th.ObjectType(
+            th.Property("id", th.IntegerType),
+            th.Property("name", th.StringType),
+            th.Property("staff", th.ArrayType(th.ObjectType(
+                th.Property("firstname", th.StringType),
+                th.Property("lastname", th.StringType),
+                th.Property("company", th.StringType),
+                th.Property("title", th.StringType),
+                th.Property("email", th.StringType),
+                th.Property("roles", th.ArrayType(th.StringType)),
+            ))),
+        ))),
+        th.Property("encoders", th.ArrayType(th.ObjectType(
+            th.Property("encoder", th.StringType),
+            th.Property("url", th.StringType),
+            th.Property("streamid", th.StringType),
+        ))),
+    ).to_dict()
+
+
+def attendees_schema() -> Dict[str, Any]:
+    return th.PropertiesList(
+        th.Property("eventid", th.IntegerType),
+        th.Property("email", th.StringType),
+        th.Property("eventuserid", th.IntegerType),
+        th.Property("exteventusercd", th.StringType),
+        th.Property("userstatus", th.StringType),
+        th.Property("isblocked", th.StringType),
+        th.Property("engagementscore", th.NumberType),
+        th.Property("liveminutes", th.IntegerType),
+        th.Property("liveviewed", th.IntegerType),
+        th.Property("firstliveactivity", th.StringType),
+        th.Property("lastliveactivity", th.StringType),
+        th.Property("archiveminutes", th.IntegerType),
+        th.Property("archiveviewed", th.IntegerType),
+        th.Property("firstarchiveactivity", th.StringType),
+        th.Property("lastarchiveactivity", th.StringType),
+        th.Property("askedquestions", th.IntegerType),
+        th.Property("resourcesdownloaded", th.IntegerType),
+        th.Property("answeredpolls", th.IntegerType),
+        th.Property("answeredsurveys", th.IntegerType),
+        th.Property("answeredsurveyquestions", th.IntegerType),
+        th.Property("launchmode", th.StringType),
+        th.Property("userprofileurl", th.StringType),
+        th.Property("campaigncode", th.StringType),
+        th.Property("sourcecampaigncode", th.StringType),
+        th.Property("sourceeventid", th.IntegerType),
+        th.Property("cumulativeliveminutes", th.IntegerType),
+        th.Property("cumulativearchiveminutes", th.IntegerType),
+        th.Property("partnerref", th.StringType),
+        th.Property("attendancepartnerref", th.StringType),
+        th.Property("attendeesessions", th.IntegerType),
+        th.Property("livemediaplayerminutes", th.IntegerType),
+        th.Property("archivemediaplayerminutes", th.IntegerType),
+        th.Property("questions", th.ArrayType(th.ObjectType(
+            th.Property("questionid", th.IntegerType),
+            th.Property("createtimestamp", th.StringType),
+            th.Property("content", th.StringType),
+            th.Property("foldername", th.StringType),
+        ))),
+        th.Property("polls", th.ArrayType(th.ObjectType(
+            th.Property("pollid", th.IntegerType),
+            th.Property("pollsubmittedtimestamp", th.StringType),
+            th.Property("pollquestionid", th.IntegerType),
+            th.Property("pollquestion", th.StringType),
+            th.Property("pollanswers", th.ArrayType(th.StringType)),
+            th.Property("pollanswersdetail", th.ArrayType(th.ObjectType(
+                th.Property("answercode", th.StringType),
+                th.Property("answer", th.StringType),
+            ))),
+        ))),
+        th.Property("resources", th.ArrayType(th.ObjectType(
+            th.Property("resourceid", th.IntegerType),
+            th.Property("resourceviewed", th.StringType),
+            th.Property("resourceviewedtimestamp", th.StringType),
+        ))),
+        th.Property("certificationwidgetresult", th.StringType),
+        th.Property("certificationcredit", th.StringType),
+        th.Property("certificationtimestamp", th.StringType),
+        th.Property("certifications", th.ArrayType(th.ObjectType(
+            th.Property("certificationid", th.IntegerType),
+            th.Property("certificationname", th.StringType),
+            th.Property("certificationcredit", th.StringType),
+            th.Property("certificationurl", th.StringType),
+            th.Property("certificationtimestamp", th.StringType),
+            th.Property("certificationresult", th.StringType),
+        ))),
+        th.Property("democonversions", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("meetingconversions", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("contactus", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("getpricing", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("freetrial", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("drift", th.ArrayType(th.ObjectType(
+            th.Property("widgetid", th.IntegerType),
+            th.Property("widgetname", th.StringType),
+            th.Property("widgettype", th.StringType),
+            th.Property("widgetaction", th.StringType),
+            th.Property("widgetsubmittedtimestamp", th.StringType),
+        ))),
+        th.Property("locationvisits", th.ArrayType(th.ObjectType(
+            th.Property("locationid", th.IntegerType),
+            th.Property("locationcode", th.StringType),
+            th.Property("locationname", th.StringType),
+            th.Property("sponsorid", th.IntegerType),
+            th.Property("sponsorname", th.StringType),
+            th.Property("visits", th.IntegerType),
+            th.Property("visitsduration", th.IntegerType),
+            th.Property("cumulativevisitsduration", th.IntegerType),
+        ))),
+        th.Property("surveys", th.ArrayType(th.ObjectType(
+            th.Property("surveyid", th.StringType),
+            th.Property("surveysubmittedtimestamp", th.StringType),
+            th.Property("surveyquestions", th.ArrayType(th.ObjectType(
+                th.Property("surveyquestionid", th.IntegerType),
+                th.Property("surveyquestion", th.StringType),
+                th.Property("questioncode", th.StringType),
+                th.Property("primaryquestioncode", th.StringType),
+                th.Property("surveyanswers", th.ArrayType(th.StringType)),
+                th.Property("surveyanswersdetail", th.ArrayType(th.ObjectType(
+                    th.Property("answercode", th.StringType),
+                    th.Property("answer", th.StringType),
+                ))),
+            ))),
+        ))),
+    ).to_dict()
+
+
+def registrants_schema() -> Dict[str, Any]:
+    return th.PropertiesList(
+        th.Property("eventid", th.IntegerType),
+        th.Property("eventuserid", th.IntegerType),
+        th.Property("firstname", th.StringType),
+        th.Property("lastname", th.StringType),
+        th.Property("email", th.StringType),
+        th.Property("company", th.StringType),
+        th.Property("jobtitle", th.StringType),
+        th.Property("addressstreet1", th.StringType),
+        th.Property("addressstreet2", th.StringType),
+        th.Property("city", th.StringType),
+        th.Property("state", th.StringType),
+        th.Property("zip", th.StringType),
+        th.Property("country", th.StringType),
+        th.Property("workphone", th.StringType),
+        th.Property("jobfunction", th.StringType),
+        th.Property("companyindustry", th.StringType),
+        th.Property("companysize", th.StringType),
+        th.Property("partnerref", th.StringType),
+        th.Property("std1", th.StringType),
+        th.Property("std2", th.StringType),
+        th.Property("std3", th.StringType),
+        th.Property("std4", th.StringType),
+        th.Property("std5", th.StringType),
+        th.Property("std6", th.StringType),
+        th.Property("std7", th.StringType),
+        th.Property("std8", th.StringType),
+        th.Property("std9", th.StringType),
+        th.Property("std10", th.StringType),
+        th.Property("fax", th.StringType),
+        th.Property("username", th.StringType),
+        th.Property("exteventusercd", th.StringType),
+        th.Property("other", th.StringType),
+        th.Property("notes", th.StringType),
+        th.Property("marketingemail", th.StringType),
+        th.Property("eventemail", th.StringType),
+        th.Property("homephone", th.StringType),
+        th.Property("createtimestamp", th.StringType),
+        th.Property("lastactivity", th.StringType),
+        th.Property("browser", th.StringType),
+        th.Property("ipaddress", th.StringType),
+        th.Property("os", th.StringType),
+        th.Property("emailformat", th.StringType),
+        th.Property("engagementprediction", th.StringType),
+        th.Property("userprofileurl", th.StringType),
+        th.Property("campaigncode", th.StringType),
+        th.Property("sourcecampaigncode", th.StringType),
+        th.Property("sourceeventid", th.IntegerType),
+        th.Property("userstatus", th.StringType),
+        th.Property("utmsource", th.StringType),
+        th.Property("utmmedium", th.StringType),
+        th.Property("utmcampaign", th.StringType),
+        th.Property("utmterm", th.StringType),
+        th.Property("utmcontent", th.StringType),
+        th.Property("attendeetype", th.StringType),
+    ).to_dict()
+
+
+BUILDERS = {
+    "events": events_schema,
+    "attendees": attendees_schema,
+    "registrants": registrants_schema,
+}
@@ -0,0 +1,227 @@
+"""Incremental parsing of ON24 page responses, one record at a time."""
+
+import codecs
+import json
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+_NUMBER_END = re.compile(r"[,\]}\s]")
+_END = object()
+# A connection lost while the body is read; the page can be requested again
+_DROPPED = (requests.exceptions.ChunkedEncodingError, requests.ConnectionError)
+
+
+class StreamedPage:
+    """A page response whose `records_key` array is parsed lazily from the socket.
+
+    Other top-level fields (totalattendees, currentpage, ...) are decoded as they
+    are reached: fields that precede the array are available immediately, fields
+    that follow it once the records have been iterated. Peak memory is one record
+    plus one read chunk instead of the whole decoded page.
+
+    `page.get(records_key)` returns the page itself, so callers written against
+    `response.json()` dicts work unchanged.
+
+    `on_complete(page)` is called once the whole object has been read, when `count`,
+    `bytes_read` and `seconds` (spent reading and decoding, not in the caller) are final.
+
+    If the connection drops mid-body, `reopen()` requests the same page again (up to
+    `max_resumes` times) and the records already read are skipped, so the caller
+    sees each record once. The response is closed when the page has been read, when
+    iteration stops early, or on `close()`.
+    """
+
+    def __init__(self, response: requests.Response, records_key: str, chunk_size: int = 64 * 1024,
+                 on_complete: Optional[Callable[["StreamedPage"], None]] = None,
+                 reopen: Optional[Callable[[], requests.Response]] = None, max_resumes: int = 0):
+        started = time.perf_counter()
+        self.records_key = records_key
+        self.chunk_size = chunk_size
+        self.fields: Dict[str, Any] = {}
+        self.count = 0
+        self.bytes_read = 0
+        self.seconds = 0.0
+        self.resumes = 0
+        self._on_complete = on_complete
+        self._reopen = reopen
+        self._max_resumes = max_resumes
+        self._peeked = []
+        self._response = response
+        try:
+            self._open(response)
+        except _DROPPED as e:
+            self._recover(e)
+        self.seconds += time.perf_counter() - started
+
+    def _open(self, response: requests.Response) -> None:
+        """Start parsing `response` from its first byte, up to the records array."""
+        self._response = response
+        self._chunks = response.iter_content(self.chunk_size)
+        self._text = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._in_records = False
+        self._done = False
+        if self._skip_ws() != "{":
+            raise ValueError(f"Expected a JSON object in {self.records_key} page response.")
+        self._pos += 1
+        self._parse_members()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == self.records_key:
+            return self
+        return self.fields.get(key, default)
+
+    def __bool__(self) -> bool:
+        if not self._peeked:
+            record = self._next_resumable()
+            if record is _END:
+                return False
+            self._peeked.append(record)
+        return True
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            while self._peeked:
+                yield self._peeked.pop(0)
+            while True:
+                started = time.perf_counter()
+                record = self._next_resumable()
+                self.seconds += time.perf_counter() - started
+                if record is _END:
+                    return
+                yield record
+        finally:
+            if not self._done:
+                # Stopped mid-page: hand the connection back instead of leaving it half-read
+                self.close()
+
+    def close(self) -> None:
+        self._done = True
+        self._response.close()
+
+    def _next_resumable(self) -> Any:
+        while True:
+            try:
+                return self._next_record()
+            except _DROPPED as e:
+                self._recover(e)
+
+    def _recover(self, error: Exception) -> None:
+        """Resume after a dropped connection, or close the page and raise once out of attempts."""
+        while True:
+            if self._reopen is None or self.resumes >= self._max_resumes:
+                self.close()
+                raise error
+            try:
+                self._resume(error)
+                return
+            except _DROPPED as e:
+                error = e
+
+    def _resume(self, error: Exception) -> None:
+        """Request the page again after a dropped connection and skip the records already decoded."""
+        self.resumes += 1
+        decoded = self.count
+        logging.warning(f"{type(error).__name__} reading a {self.records_key} page after {decoded} records; "
+                        f"requesting it again (resume {self.resumes} of {self._max_resumes}).")
+        self._response.close()
+        self._open(self._reopen())
+        self.count = 0
+        try:
+            for _ in range(decoded):
+                if self._next_record() is _END:
+                    raise ValueError(f"The {self.records_key} page has fewer records on retry than were already read.")
+        finally:
+            # Dropped again while skipping: the next attempt skips the same records
+            self.count = decoded
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already consumed."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            tail = self._text.decode(b"", final=True)
+        else:
+            self.bytes_read += len(chunk)
+            tail = self._text.decode(chunk)
+        self._buf = self._buf[self._pos:] + tail
+        self._pos = 0
+        return chunk is not None or bool(tail)
+
+    def _skip_ws(self) -> str:
+        """Advance past whitespace; return the next character ('' at end of input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _decode_value(self) -> Any:
+        if self._buf[self._pos] in _NUMBER_START:
+            # A number cut at the chunk edge still decodes ("3." -> 3): read up to its delimiter first
+            while _NUMBER_END.search(self._buf, self._pos) is None and self._fill():
+                pass
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self._pos = end
+            return value
+
+    def _parse_members(self) -> None:
+        """Decode top-level members until the records array opens or the object closes."""
+        while True:
+            c = self._skip_ws()
+            if c == ",":
+                self._pos += 1
+                continue
+            if c == "":
+                raise ValueError(f"Truncated {self.records_key} page response.")
+            if c == "}":
+                self.close()
+                if self._on_complete is not None:
+                    self._on_complete(self)
+                return
+            key = self._decode_value()
+            if self._skip_ws() != ":":
+                raise ValueError(f"Malformed JSON in {self.records_key} page response.")
+            self._pos += 1
+            if self._skip_ws() == "[" and key == self.records_key:
+                self._pos += 1
+                self._in_records = True
+                return
+            self.fields[key] = self._decode_value()
+
+    def _next_record(self) -> Any:
+        if not self._in_records:
+            return _END
+        c = self._skip_ws()
+        if c == ",":
+            self._pos += 1
+            c = self._skip_ws()
+        if c == "]":
+            self._pos += 1
+            self._in_records = False
+            self._parse_members()
+            return _END
+        if c == "":
+            raise ValueError(f"Truncated {self.records_key} page response.")
+        record = self._decode_value()
+        self.count += 1
+        return record
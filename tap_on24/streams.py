@@ -1,517 +1,831 @@
-from typing import Any, Dict, Optional, Iterable
-from singer_sdk import typing as th
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Iterable, Tuple
+from functools import cached_property
+try:
+    from singer_sdk.helpers.conform import TypeConformanceLevel
+except ImportError:  # singer-sdk < 0.47
+    from singer_sdk.helpers._typing import TypeConformanceLevel
 from singer_sdk.streams import Stream
 from tap_on24.client import ON24Client
+from tap_on24.coercion import RecordCoercer
+from tap_on24.event_index import EventIndex, IndexedEvent
+from tap_on24.fingerprints import fingerprint
+from tap_on24.metrics import COUNT_BUCKETS, ON24Metric
+from tap_on24.prefetch import ReadAhead, prefetch
+from tap_on24.projection import ProjectionPlan, compile_projection, project, project_schema
+from tap_on24.schemas import LazySchema
+from tap_on24.streaming import StreamedPage
 
 class ON24EventsStream(Stream):
     name = "events"
     primary_keys = ["eventid"]
     replication_key = "lastupdated"
-    schema = th.PropertiesList(
-        th.Property("eventid", th.IntegerType),
-        th.Property("clientid", th.IntegerType),
-        th.Property("goodafter", th.StringType),
-        th.Property("isactive", th.BooleanType),
-        th.Property("regrequired", th.BooleanType),
-        th.Property("description", th.StringType),
-        th.Property("promotionalsummary", th.StringType),
-        th.Property("regnotificationrequired", th.BooleanType),
-        th.Property("displaytimezonecd", th.StringType),
-        th.Property("eventtype", th.StringType),
-        th.Property("category", th.StringType),
-        th.Property("createtimestamp", th.StringType),
-        th.Property("localelanguagecd", th.StringType),
-        th.Property("localecountrycd", th.StringType),
-        th.Property("lastmodified", th.StringType),
-        th.Property("lastupdated", th.StringType),
-        th.Property("iseliteexpired", th.StringType),
-        th.Property("application", th.StringType),
-        th.Property("livestart", th.StringType),
-        th.Property("liveend", th.StringType),
-        th.Property("archivestart", th.StringType),
-        th.Property("archiveend", th.StringType),
-        th.Property("audienceurl", th.StringType),
-        th.Property("contenttype", th.StringType),
-        th.Property("campaigncode", th.StringType),
-        th.Property("eventlocation", th.StringType),
-        th.Property("createdby", th.StringType),
-        th.Property("ishybridevent", th.BooleanType),
-        th.Property("istestevent", th.BooleanType),
-        th.Property("eventprofile", th.StringType),
-        th.Property("streamtype", th.StringType),
-        th.Property("audiencekey", th.StringType),
-        th.Property("extaudienceurl", th.StringType),
-        th.Property("reporturl", th.StringType),
-        th.Property("uploadurl", th.StringType),
-        th.Property("pmurl", th.StringType),
-        th.Property("previewurl", th.StringType),
-        th.Property("eventanalytics", th.ObjectType(
-            th.Property("totalregistrants", th.IntegerType),
-            th.Property("totalattendees", th.IntegerType),
-            th.Property("noshowcount", th.IntegerType),
-            th.Property("registrationpagehits", th.IntegerType),
-            th.Property("numberofgetpricingrequests", th.IntegerType),
-            th.Property("numberoffreetrialrequests", th.IntegerType),
-            th.Property("numberofresourcesavailable", th.IntegerType),
-            th.Property("attendeeswhodownloadedresource", th.IntegerType),
-            th.Property("uniqueattendeeresourcedownloads", th.IntegerType),
-            th.Property("numberofmeetingconversions", th.IntegerType),
-            th.Property("numberofdemoconversions", th.IntegerType),
-            th.Property("averagearchiveminutes", th.IntegerType),
-            th.Property("averagecumulativearchiveminutes", th.IntegerType),
-            th.Property("totalcumulativeliveminutes", th.IntegerType),
-            th.Property("totalcumulativearchiveminutes", th.IntegerType),
-            th.Property("totalcumulativeminutes", th.IntegerType),
-            th.Property("totalmediaplayerminutes", th.IntegerType),
-            th.Property("totallivemediaplayerminutes", th.IntegerType),
-            th.Property("totalarchivemediaplayerminutes", th.IntegerType),
-            th.Property("liveattendees", th.IntegerType),
-            th.Property("ondemandattendees", th.IntegerType),
-            th.Property("averageliveminutes", th.IntegerType),
-            th.Property("averagecumulativeliveminutes", th.IntegerType),
-        )),
-        th.Property("scheduledeventduration", th.IntegerType),
-        th.Property("eventstd1", th.StringType),
-        th.Property("eventstd2", th.StringType),
-        th.Property("eventstd3", th.StringType),
-        th.Property("eventstd4", th.StringType),
-        th.Property("eventstd5", th.StringType),
-        th.Property("tags", th.ArrayType(th.StringType)),
-        th.Property("funnelstages", th.ArrayType(th.StringType)),
-        th.Property("speakers", th.ArrayType(th.ObjectType(
-            th.Property("name", th.StringType),
-            th.Property("title", th.StringType),
-            th.Property("company", th.StringType),
-            th.Property("description", th.StringType),
-        ))),
-        th.Property("partnerrefstats", th.ArrayType(th.ObjectType(
-            th.Property("code", th.StringType),
-            th.Property("count", th.IntegerType),
-        ))),
-        th.Property("surveyurls", th.ArrayType(th.StringType)),
-        th.Property("customaccounttags", th.ArrayType(th.ObjectType(
-            th.Property("groupid", th.IntegerType),
-            th.Property("groupname", th.StringType),
-            th.Property("tagid", th.IntegerType),
-            th.Property("tagname", th.StringType),
-        ))),
-        th.Property("customeventfields", th.ArrayType(th.ObjectType(
-            th.Property("name", th.StringType),
-            th.Property("label", th.StringType),
-            th.Property("value", th.StringType),
-        ))),
-        th.Property("media", th.ObjectType(
-            th.Property("audios", th.ArrayType(th.StringType)),
-            th.Property("videos", th.ArrayType(th.StringType)),
-            th.Property("slides", th.ArrayType(th.StringType)),
-            th.Property("videoclips", th.ArrayType(th.StringType)),
-            th.Property("urls", th.ArrayType(th.StringType)),
-            th.Property("polls", th.ArrayType(th.StringType)),
-        )),
-        th.Property("categories", th.ArrayType(th.StringType)),
-        th.Property("tracks", th.ArrayType(th.StringType)),
-        th.Property("livedays", th.ArrayType(th.ObjectType(
-            th.Property("id", th.IntegerType),
-            th.Property("title", th.StringType),
-            th.Property("livestarttime", th.StringType),
-            th.Property("liveendtime", th.StringType),
-        ))),
-        th.Property("contents", th.ArrayType(th.ObjectType(
-            th.Property("title", th.StringType),
-            th.Property("type", th.StringType),
-            th.Property("status", th.StringType),
-            th.Property("resourceid", th.IntegerType),
-            th.Property("externalurl", th.StringType),
-        ))),
-        th.Property("sponsors", th.ArrayType(th.ObjectType(
-            th.Property("id", th.IntegerType),
-            th.Property("name", th.StringType),
-            th.Property("staff", th.ArrayType(th.ObjectType(
-                th.Property("firstname", th.StringType),
-                th.Property("lastname", th.StringType),
-                th.Property("company", th.StringType),
-                th.Property("title", th.StringType),
-                th.Property("email", th.StringType),
-                th.Property("roles", th.ArrayType(th.StringType)),
-            ))),
-        ))),
-        th.Property("encoders", th.ArrayType(th.ObjectType(
-            th.Property("encoder", th.StringType),
-            th.Property("url", th.StringType),
-            th.Property("streamid", th.StringType),
-        ))),
-    ).to_dict()
-
-    def __init__(self, tap):
-        super().__init__(tap)
-        self.client = ON24Client(
-            tap.config.get("client_id"),
-            tap.config.get("access_token_key"),
-            tap.config.get("access_token_secret")
-        )
+    schema = LazySchema("events")
+
+    @property
+    def client(self) -> ON24Client:
+        # Shared, tap-owned client so every stream reuses the same connection pool
+        return self._tap.client
 
     def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
-        from datetime import datetime, timezone, timedelta
+        # Fill the run-scoped index as we go so child streams never page /event again
+        index: EventIndex = self._tap.event_index
+        index.reset()
+        seen = set()
+        metrics = self._tap.metrics
+        try:
+            with metrics.timer(ON24Metric.STREAM_DURATION, stream=self.name), self._tap.profile(self.name):
+                for client_id, page in prefetch(self._paginate_clients(context), int(self.config.get("prefetch_pages", 2))):
+                    for event in page:
+                        # Incremental runs scan two overlapping ranges; emit each event once
+                        if event.get("eventid") in seen:
+                            continue
+                        if event.get("eventid") is not None and not self._tap.event_in_slice(int(event["eventid"])):
+                            continue
+                        seen.add(event.get("eventid"))
+                        index.add(event, client_id)
+                        yield event
+                for client_id, page in self._paginate_catch_up(context):
+                    # Already emitted in an earlier run: only the child streams need these
+                    for event in page:
+                        if event.get("eventid") is None or int(event["eventid"]) in index:
+                            continue
+                        if self._tap.event_in_slice(int(event["eventid"])):
+                            index.add(event, client_id)
+                index.mark_complete()
+        finally:
+            metrics.increment(ON24Metric.RECORD_COUNT, len(seen), stream=self.name)
+
+    def _paginate_clients(self, context: Optional[dict]) -> Iterable[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield (client_id, page) for every configured ON24 client in turn."""
+        for client_id, client in self._tap.clients.items():
+            for page in self._paginate_events(client, context):
+                yield client_id, page
+
+    def _date_range(self) -> Tuple[Optional[str], Optional[str]]:
+        """on24_start_date..on24_end_date, clamped to today; (None, None) without a start date."""
         start_date = self.config.get("on24_start_date")
         end_date = self.config.get("on24_end_date")
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        if start_date:
-            if start_date > today:
-                start_date = today
-            if not end_date:
-                end_date = today
-            if end_date < start_date:
-                end_date = start_date
-        items_per_page = max(10, int(self.config.get("items_per_page") or 100))
+        if not start_date:
+            return None, None
+        today = self._tap.now.strftime("%Y-%m-%d")
+        if start_date > today:
+            start_date = today
+        if not end_date:
+            end_date = today
+        if end_date < start_date:
+            end_date = start_date
+        return start_date, end_date
+
+    def _updated_since(self, context: Optional[dict]) -> Optional[str]:
+        """Start of the incremental `updated` scan, or None for a full scan (no bookmark or no dates)."""
+        start_date, end_date = self._date_range()
+        bookmark = self.get_starting_replication_key_value(context)
+        if not start_date or not bookmark:
+            return None
+        return min(max(start_date, str(bookmark)[:10]), end_date)
+
+    def _paginate_events(self, client: ON24Client, context: Optional[dict]) -> Iterable[List[Dict[str, Any]]]:
+        from datetime import timedelta
+        start_date, end_date = self._date_range()
         if not start_date:
             # No dates: API returns past 3 months
-            page_offset = 0
-            while True:
-                data = self.client.get_events(None, None, items_per_page, page_offset)
-                events = data.get("events", [])
-                for event in events:
-                    if "lastupdated" not in event:
-                        event["lastupdated"] = None
-                    yield event
-                if len(events) < items_per_page:
-                    break
-                page_offset += 1
+            yield from self._paginate_window(client, None, None)
+            return
+        updated_since = self._updated_since(context)
+        if not updated_since:
+            yield from self._paginate_range(client, start_date, end_date)
+            return
+        # Incremental: events updated since the bookmark, plus events recent enough
+        # that their attendees/registrants may still be changing
+        self.logger.info(f"Resuming events from bookmark {self.get_starting_replication_key_value(context)} "
+                         f"(updated since {updated_since}).")
+        yield from self._paginate_range(client, updated_since, end_date, self.config.get("incremental_date_filter_mode") or "updated")
+        lookback_days = int(self.config.get("activity_lookback_days") or 0)
+        if lookback_days > 0:
+            recent_start = (self._tap.now - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+            recent_start = max(start_date, recent_start)
+            if recent_start <= end_date:
+                yield from self._paginate_range(client, recent_start, end_date)
+
+    def _paginate_catch_up(self, context: Optional[dict]) -> Iterable[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield (client_id, page) of the older events selected child streams have not synced yet.
+
+        A child stream's `index_bookmark` is the newest `lastupdated` of the last index
+        it worked through to the end. A child stream that is newly selected, or was
+        interrupted, is behind this stream's bookmark: scan /event again from its own
+        (or over the full range if it has none), for the index only.
+        """
+        updated_since = self._updated_since(context)
+        if not updated_since:
             return
+        start_date, end_date = self._date_range()
+        marks = [stream.stream_state.get("index_bookmark") for stream in self._tap.streams.values()
+                 if isinstance(stream, ON24EventChildStream) and stream.selected]
+        if not marks:
+            return
+        if all(marks):
+            since = min(max(start_date, min(str(mark)[:10] for mark in marks)), end_date)
+            if since >= updated_since:
+                return
+            self.logger.info(f"Indexing events updated since {since} for child streams behind the events bookmark.")
+            mode = self.config.get("incremental_date_filter_mode") or "updated"
+        else:
+            since, mode = start_date, None
+            self.logger.info(f"Indexing all events from {since}: a selected child stream has not synced them yet.")
+        for client_id, client in self._tap.clients.items():
+            for page in self._paginate_range(client, since, end_date, mode):
+                yield client_id, page
+
+    def _plan_windows(self, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """Split start_date..end_date into 180-day windows (the API maximum)."""
+        from datetime import datetime, timezone, timedelta
+        windows = []
         chunk_start, chunk_end = start_date, end_date
         while chunk_start and chunk_end:
             start_dt = datetime.strptime(chunk_start, "%Y-%m-%d").replace(tzinfo=timezone.utc)
             end_dt = datetime.strptime(chunk_end, "%Y-%m-%d").replace(tzinfo=timezone.utc)
             window_end = chunk_end if (end_dt - start_dt).days <= 180 else (start_dt + timedelta(days=180)).strftime("%Y-%m-%d")
-            page_offset = 0
-            while True:
-                data = self.client.get_events(chunk_start, window_end, items_per_page, page_offset)
-                events = data.get("events", [])
-                for event in events:
-                    if "lastupdated" not in event:
-                        event["lastupdated"] = None
-                    yield event
-                if len(events) < items_per_page:
-                    break
-                page_offset += 1
+            windows.append((chunk_start, window_end))
             next_start = datetime.strptime(window_end, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
             if next_start > end_dt:
                 break
             chunk_start = next_start.strftime("%Y-%m-%d")
+        return windows
 
-class ON24AttendeesStream(Stream):
-    name = "attendees"
-    primary_keys = ["eventid", "eventuserid"]
-    schema = th.PropertiesList(
-        th.Property("eventid", th.IntegerType),
-        th.Property("email", th.StringType),
-        th.Property("eventuserid", th.IntegerType),
-        th.Property("exteventusercd", th.StringType),
-        th.Property("userstatus", th.StringType),
-        th.Property("isblocked", th.StringType),
-        th.Property("engagementscore", th.NumberType),
-        th.Property("liveminutes", th.IntegerType),
-        th.Property("liveviewed", th.IntegerType),
-        th.Property("firstliveactivity", th.StringType),
-        th.Property("lastliveactivity", th.StringType),
-        th.Property("archiveminutes", th.IntegerType),
-        th.Property("archiveviewed", th.IntegerType),
-        th.Property("firstarchiveactivity", th.StringType),
-        th.Property("lastarchiveactivity", th.StringType),
-        th.Property("askedquestions", th.IntegerType),
-        th.Property("resourcesdownloaded", th.IntegerType),
-        th.Property("answeredpolls", th.IntegerType),
-        th.Property("answeredsurveys", th.IntegerType),
-        th.Property("answeredsurveyquestions", th.IntegerType),
-        th.Property("launchmode", th.StringType),
-        th.Property("userprofileurl", th.StringType),
-        th.Property("campaigncode", th.StringType),
-        th.Property("sourcecampaigncode", th.StringType),
-        th.Property("sourceeventid", th.IntegerType),
-        th.Property("cumulativeliveminutes", th.IntegerType),
-        th.Property("cumulativearchiveminutes", th.IntegerType),
-        th.Property("partnerref", th.StringType),
-        th.Property("attendancepartnerref", th.StringType),
-        th.Property("attendeesessions", th.IntegerType),
-        th.Property("livemediaplayerminutes", th.IntegerType),
-        th.Property("archivemediaplayerminutes", th.IntegerType),
-        th.Property("questions", th.ArrayType(th.ObjectType(
-            th.Property("questionid", th.IntegerType),
-            th.Property("createtimestamp", th.StringType),
-            th.Property("content", th.StringType),
-            th.Property("foldername", th.StringType),
-        ))),
-        th.Property("polls", th.ArrayType(th.ObjectType(
-            th.Property("pollid", th.IntegerType),
-            th.Property("pollsubmittedtimestamp", th.StringType),
-            th.Property("pollquestionid", th.IntegerType),
-            th.Property("pollquestion", th.StringType),
-            th.Property("pollanswers", th.ArrayType(th.StringType)),
-            th.Property("pollanswersdetail", th.ArrayType(th.ObjectType(
-                th.Property("answercode", th.StringType),
-                th.Property("answer", th.StringType),
-            ))),
-        ))),
-        th.Property("resources", th.ArrayType(th.ObjectType(
-            th.Property("resourceid", th.IntegerType),
-            th.Property("resourceviewed", th.StringType),
-            th.Property("resourceviewedtimestamp", th.StringType),
-        ))),
-        th.Property("certificationwidgetresult", th.StringType),
-        th.Property("certificationcredit", th.StringType),
-        th.Property("certificationtimestamp", th.StringType),
-        th.Property("certifications", th.ArrayType(th.ObjectType(
-            th.Property("certificationid", th.IntegerType),
-            th.Property("certificationname", th.StringType),
-            th.Property("certificationcredit", th.StringType),
-            th.Property("certificationurl", th.StringType),
-            th.Property("certificationtimestamp", th.StringType),
-            th.Property("certificationresult", th.StringType),
-        ))),
-        th.Property("democonversions", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("meetingconversions", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("contactus", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("getpricing", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("freetrial", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("drift", th.ArrayType(th.ObjectType(
-            th.Property("widgetid", th.IntegerType),
-            th.Property("widgetname", th.StringType),
-            th.Property("widgettype", th.StringType),
-            th.Property("widgetaction", th.StringType),
-            th.Property("widgetsubmittedtimestamp", th.StringType),
-        ))),
-        th.Property("locationvisits", th.ArrayType(th.ObjectType(
-            th.Property("locationid", th.IntegerType),
-            th.Property("locationcode", th.StringType),
-            th.Property("locationname", th.StringType),
-            th.Property("sponsorid", th.IntegerType),
-            th.Property("sponsorname", th.StringType),
-            th.Property("visits", th.IntegerType),
-            th.Property("visitsduration", th.IntegerType),
-            th.Property("cumulativevisitsduration", th.IntegerType),
-        ))),
-        th.Property("surveys", th.ArrayType(th.ObjectType(
-            th.Property("surveyid", th.StringType),
-            th.Property("surveysubmittedtimestamp", th.StringType),
-            th.Property("surveyquestions", th.ArrayType(th.ObjectType(
-                th.Property("surveyquestionid", th.IntegerType),
-                th.Property("surveyquestion", th.StringType),
-                th.Property("questioncode", th.StringType),
-                th.Property("primaryquestioncode", th.StringType),
-                th.Property("surveyanswers", th.ArrayType(th.StringType)),
-                th.Property("surveyanswersdetail", th.ArrayType(th.ObjectType(
-                    th.Property("answercode", th.StringType),
-                    th.Property("answer", th.StringType),
-                ))),
-            ))),
-        ))),
-    ).to_dict()
-
-    def __init__(self, tap):
-        super().__init__(tap)
-        self.client = ON24Client(
-            tap.config.get("client_id"),
-            tap.config.get("access_token_key"),
-            tap.config.get("access_token_secret")
-        )
+    def _paginate_range(self, client: ON24Client, start_date: str, end_date: str,
+                        date_filter_mode: Optional[str] = None) -> Iterable[List[Dict[str, Any]]]:
+        """Page through start_date..end_date window by window, in window order."""
+        windows = self._plan_windows(start_date, end_date)
+        workers = max(1, int(self.config.get("event_window_workers") or 1))
+        if workers == 1:
+            for window_start, window_end in windows:
+                yield from self._paginate_window(client, window_start, window_end, date_filter_mode)
+            return
+        yield from self._scan_windows(client, windows, workers, date_filter_mode)
+
+    def _scan_windows(self, client: ON24Client, windows: List[Tuple[str, str]], workers: int,
+                      date_filter_mode: Optional[str] = None) -> Iterable[List[Dict[str, Any]]]:
+        """Scan up to `workers` windows at once, emitting their pages strictly in window order.
+
+        A window that turns out to be dense is split in two and its halves take its
+        place in the queue, so page counts even out across workers.
+        """
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="events-window") as pool:
+            waiting = deque(windows)
+            pending = deque()
+            while waiting or pending:
+                while waiting and len(pending) < workers:
+                    pending.append(pool.submit(self._scan_window, client, *waiting.popleft(), date_filter_mode))
+                pages, halves = pending.popleft().result()
+                if halves:
+                    # Halves go ahead of everything already queued to keep window order
+                    pending.extendleft(reversed([pool.submit(self._scan_window, client, *half, date_filter_mode) for half in halves]))
+                    continue
+                yield from pages
+
+    def _scan_window(self, client: ON24Client, start_date: str, end_date: str,
+                     date_filter_mode: Optional[str] = None) -> Tuple[List[List[Dict[str, Any]]], List[Tuple[str, str]]]:
+        """Fetch one window's pages, or return its two halves if it has too many pages."""
+        from datetime import datetime, timedelta
+        # One size per window: pages of a window must all share the size their offsets assume
+        items_per_page = self._tap.page_sizers["events"].size
+        max_pages = max(1, int(self.config.get("max_pages_per_window") or 10))
+        events, total = self._fetch_events_page(client, start_date, end_date, items_per_page, 0, date_filter_mode)
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        days = (datetime.strptime(end_date, "%Y-%m-%d") - start_dt).days
+        if total is not None and -(-int(total) // items_per_page) > max_pages and days >= 1:
+            middle = (start_dt + timedelta(days=days // 2)).strftime("%Y-%m-%d")
+            next_day = (start_dt + timedelta(days=days // 2 + 1)).strftime("%Y-%m-%d")
+            self.logger.info(f"Events window {start_date}..{end_date} holds {total} events; splitting at {middle}.")
+            return [], [(start_date, middle), (next_day, end_date)]
+        pages = [events]
+        page_offset = 0
+        while len(events) >= items_per_page:
+            page_offset += 1
+            events, _ = self._fetch_events_page(client, start_date, end_date, items_per_page, page_offset, date_filter_mode)
+            pages.append(events)
+        return pages, []
+
+    def _paginate_window(self, client: ON24Client, start_date: Optional[str], end_date: Optional[str],
+                         date_filter_mode: Optional[str] = None) -> Iterable[List[Dict[str, Any]]]:
+        items_per_page = self._tap.page_sizers["events"].size
+        page_offset = 0
+        while True:
+            events, _ = self._fetch_events_page(client, start_date, end_date, items_per_page, page_offset, date_filter_mode)
+            yield events
+            if len(events) < items_per_page:
+                break
+            page_offset += 1
+
+    def _fetch_events_page(self, client: ON24Client, start_date: Optional[str], end_date: Optional[str], items_per_page: int,
+                           page_offset: int, date_filter_mode: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return one page of events and the window's totalevents (if reported)."""
+        data = client.get_events(start_date, end_date, items_per_page, page_offset,
+                                 date_filter_mode=date_filter_mode)
+        events = data.get("events", [])
+        for event in events:
+            if "lastupdated" not in event:
+                event["lastupdated"] = None
+        return events, data.get("totalevents")
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ON24 timestamp (ISO 8601, usually with offset) to an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class ON24EventChildStream(Stream):
+    """Base for streams fetched per event (attendees, registrants)."""
+    records_key: str = ""
+    total_key: str = ""
+    # Record timestamps that show the event is still collecting activity
+    activity_fields: Tuple[str, ...] = ()
+    # eventid of the last partition in partitioned mode, after which the whole index is done
+    _last_partition: Optional[int] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.config.get("fast_output"):
+            # RecordCoercer already fixed the nested integers; only the root keys still
+            # need the SDK's pass (unmapped-property removal, booleans, dates).
+            self.TYPE_CONFORMANCE_LEVEL = TypeConformanceLevel.ROOT_ONLY
+        self._last_checkpoint = time.monotonic()
+        self._pages_since_checkpoint = 0
+
+    @property
+    def client(self) -> ON24Client:
+        # Shared, tap-owned client so every stream reuses the same connection pool
+        return self._tap.client
+
+    def fetch_page(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def fetch_page_async(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @cached_property
+    def projection(self) -> Optional[ProjectionPlan]:
+        """Catalog selection as a plan of subtrees to drop; None when everything is selected.
+
+        Keys and activity timestamps are kept: bookmarks are computed from them.
+        """
+        return compile_projection(self.schema, self.mask, keep=list(self.primary_keys) + list(self.activity_fields))
+
+    @cached_property
+    def coercer(self) -> RecordCoercer:
+        # Compiled once from the (projected) schema instead of walking every key of every record
+        return RecordCoercer(project_schema(self.schema, self.projection))
+
+    def project_page(self, records: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Drop deselected subtrees from a freshly decoded page, before it is buffered or cast."""
+        plan = self.projection
+        if plan is None:
+            return records
+        if isinstance(records, list):
+            for record in records:
+                project(record, plan)
+            return records
+        # A streamed page: project each record as it comes off the socket
+        return (project(record, plan) for record in records)
+
+    @property
+    def partitions(self) -> Optional[List[Dict[str, Any]]]:
+        """One SDK partition per event in partitioned mode, so state is tracked per eventid."""
+        if not self.config.get("partitioned"):
+            return None
+        partitions = [{"eventid": eventid} for eventid, _ in self.candidate_events()]
+        self._last_partition = partitions[-1]["eventid"] if partitions else None
+        if not partitions:
+            self.finish_index()
+        return partitions
+
+    def finish_index(self) -> None:
+        """Record that every event of this run's index went through the stream.
+
+        The newest `lastupdated` in the index becomes the `index_bookmark`: the next
+        run's index must reach back at least that far for this stream (see
+        ON24EventsStream._paginate_catch_up).
+        """
+        newest = max((indexed_event.lastupdated for _, indexed_event in self._tap.event_index.items()
+                      if parse_timestamp(indexed_event.lastupdated) is not None),
+                     key=parse_timestamp, default=None)
+        if newest is not None:
+            self.stream_state["index_bookmark"] = newest
+
+    def event_bookmarks(self, context: Optional[dict] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-event state: what each event looked like the last time we synced it.
+
+        Kept in the stream state, or in the event's own partition state in partitioned mode.
+        """
+        return self.get_context_state(context).setdefault("event_bookmarks", {})
+
+    def checkpoint(self, context: Optional[dict] = None) -> Dict[str, Any]:
+        """Progress of an unfinished run: the current event and the next page to fetch.
+
+        Events finished before it are known from their per-event bookmarks.
+        """
+        checkpoint = self.get_context_state(context).setdefault("checkpoint", {})
+        # Written by earlier versions; grew by one ID per event
+        checkpoint.pop("completed", None)
+        return checkpoint
+
+    def event_needs_sync(self, eventid: int, indexed_event: IndexedEvent, context: Optional[dict] = None) -> bool:
+        """True unless the event is unchanged since its bookmark and quiet for activity_lookback_days."""
+        from datetime import timedelta
+        saved = self.event_bookmarks(context).get(str(eventid))
+        if not saved:
+            return True
+        if saved.get("lastupdated") != indexed_event.lastupdated:
+            return True
+        if saved.get("total") != getattr(indexed_event, self.total_key):
+            return True
+        last_activity = parse_timestamp(saved.get("last_activity"))
+        lookback_days = int(self.config.get("activity_lookback_days") or 0)
+        return last_activity is not None and last_activity >= self._tap.now - timedelta(days=lookback_days)
+
+    def candidate_events(self) -> Iterable[Tuple[int, IndexedEvent]]:
+        """Yield (eventid, indexed event) for events in this tap's slice that may have records.
+
+        eventanalytics already tells us how many attendees/registrants an event has,
+        so empty events (and test events, if configured) are skipped without a call.
+        Explicit `event_ids` missing from the index are included with unknown counts.
+        With a work manifest, only the events it lists for this stream are candidates.
+        """
+        skip_empty = self.config.get("skip_empty_events", True)
+        skip_test = self.config.get("skip_test_events", False)
+        skipped = 0
+        # Get all eventids from the run-scoped event index (filled by the events stream)
+        index = self._tap.get_event_index()
+        manifest = self._tap.work_manifest
+        planned = None
+        if manifest is not None:
+            # Only the events the manifest planned for this stream
+            planned = {int(item["eventid"]) for item in manifest["streams"].get(self.name, {}).get("work", [])}
+        for eventid, indexed_event in index.items():
+            if planned is not None and eventid not in planned:
+                continue
+            known_total = getattr(indexed_event, self.total_key)
+            if (skip_test and indexed_event.istestevent) or (skip_empty and known_total == 0):
+                skipped += 1
+                continue
+            yield eventid, indexed_event
+        extra = set()
+        for eventid in self.config.get("event_ids") or []:
+            if int(eventid) not in index and self._tap.event_in_slice(int(eventid)):
+                extra.add(int(eventid))
+                yield int(eventid), IndexedEvent(None, None, None, None)
+        for eventid in self.recently_active_events():
+            if eventid not in index and eventid not in extra and self._tap.event_in_slice(eventid) \
+                    and (planned is None or eventid in planned):
+                yield eventid, IndexedEvent(None, None, None, None)
+        if skipped:
+            self.logger.info(f"Skipped {skipped} events with no {self.name} (or test events) without calling the API.")
+
+    def recently_active_events(self) -> List[int]:
+        """Events whose last synced records show activity within activity_lookback_days.
+
+        The /event lookback scan selects events by creation date, so an older event
+        still collecting activity (on-demand views, late survey answers) is not in the
+        index. Its per-event bookmark knows it was active: it is re-fetched until it has
+        been quiet for the lookback window.
+        """
+        from datetime import timedelta
+        lookback_days = int(self.config.get("activity_lookback_days") or 0)
+        if lookback_days <= 0:
+            return []
+        since = self._tap.now - timedelta(days=lookback_days)
+        states = [self.stream_state] + list(self.stream_state.get("partitions") or [])
+        active = []
+        for state in states:
+            for eventid, saved in (state.get("event_bookmarks") or {}).items():
+                last_activity = parse_timestamp(saved.get("last_activity"))
+                if last_activity is not None and last_activity >= since:
+                    active.append(int(eventid))
+        return sorted(set(active))
+
+    def plan_events(self, context: Optional[dict] = None) -> Iterable[Tuple[int, IndexedEvent]]:
+        """Candidate events, minus those unchanged since their per-event bookmark.
+
+        An event interrupted mid-way (the checkpoint's) is always finished.
+        """
+        unchanged = 0
+        resuming = self.checkpoint(context).get("eventid")
+        candidates = self.candidate_events()
+        if resuming:
+            # The checkpoint holds one event's progress: finish that event before another overwrites it
+            candidates = sorted(candidates, key=lambda item: item[0] != resuming)
+        for eventid, indexed_event in candidates:
+            if eventid != resuming and not self.event_needs_sync(eventid, indexed_event, context):
+                unchanged += 1
+                continue
+            yield eventid, indexed_event
+        if unchanged:
+            self.logger.info(f"Skipped {unchanged} events unchanged since their last {self.name} sync.")
+
+    def page_size(self) -> int:
+        """itemsPerPage for the next event, from this endpoint's PageSizer.
+
+        Picked once per event: page offsets are only meaningful at a fixed page size.
+        """
+        return self._tap.page_sizers[self.records_key].size
+
+    def _resume_page(self, eventid: int, items_per_page: int, context: Optional[dict] = None) -> int:
+        """First page of `items_per_page` records to request for `eventid` when resuming an interrupted run."""
+        saved = self.checkpoint(context)
+        if saved.get("eventid") != eventid or not saved.get("page_offset"):
+            return 0
+        # Re-express the saved offset in the current page size (never skipping records)
+        done = saved["page_offset"] * int(saved.get("items_per_page") or items_per_page)
+        return done // items_per_page
 
     def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
-        import logging
-        # Get all eventids from the events stream
-        events_stream = self._tap.streams["events"]
-        for event_idx, event in enumerate(events_stream.get_records(context)):
-            eventid = event["eventid"]
-            # ON24 API: itemsPerPage default 100, example 25; use min 10 per docs
-            items_per_page = max(10, int(self.config.get("items_per_page") or 100))
-            page_offset = 0
-            total_attendees = None
-            while True:
-                data = self.client.get_attendees(eventid, items_per_page, page_offset)
-                attendees = data.get("attendees", [])
-                if total_attendees is None:
-                    total_attendees = data.get("totalattendees")
-                if not attendees:
-                    break
-                for att_idx, attendee in enumerate(attendees):
-                    attendee["eventid"] = int(eventid)
-                    if "eventuserid" in attendee and attendee["eventuserid"] is not None:
-                        try:
-                            attendee["eventuserid"] = int(attendee["eventuserid"])
-                        except (ValueError, TypeError):
-                            attendee["eventuserid"] = None
-
-                    def cast_ids(obj):
-                        if isinstance(obj, dict):
-                            for k, v in obj.items():
-                                # Cast *_id fields to int
-                                if k.endswith("id") and v is not None:
-                                    try:
-                                        obj[k] = int(v)
-                                    except (ValueError, TypeError):
-                                        obj[k] = None
-                                # Recurse into lists and dicts, but do NOT convert pollanswers/surveyanswers
-                                elif isinstance(v, list) and k not in ("pollanswers", "surveyanswers"):
-                                    for item in v:
-                                        cast_ids(item)
-                                elif isinstance(v, dict):
-                                    cast_ids(v)
-                        elif isinstance(obj, list):
-                            for item in obj:
-                                cast_ids(item)
-
-                    # Cast *_id fields to int, preserve pollanswers/surveyanswers as arrays
-                    cast_ids(attendee)
-                    yield attendee
-                page_offset += 1
-                # Stop if we've fetched all attendees
-                if total_attendees is not None and (page_offset * items_per_page) >= total_attendees:
+        # Wall time of the whole stream, including the SDK's emission: the records/sec denominator
+        with self._tap.metrics.timer(ON24Metric.STREAM_DURATION, stream=self.name), self._tap.profile(self.name):
+            yield from self._get_records(context)
+        if not context or context.get("eventid") == self._last_partition:
+            self.finish_index()
+
+    def _get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        if context and "eventid" in context:
+            yield from self.get_partition_records(context)
+            return
+        from collections import deque
+        checkpoint = self.checkpoint()
+        if checkpoint.get("eventid"):
+            self.logger.info(
+                f"Resuming interrupted {self.name} sync: event {checkpoint['eventid']} "
+                f"from page {checkpoint.get('page_offset', 0)}."
+            )
+        events = self.plan_events()
+        max_workers = max(1, int(self.config.get("max_workers") or 1))
+        if self.config.get("stream_json") and max_workers > 1 and self._tap.async_engine is None:
+            # Streamed pages are read lazily on the emitting thread, so there is nothing to fan out
+            self.logger.info(f"stream_json is set: fetching {self.name} one event at a time.")
+            max_workers = 1
+        if self._tap.async_engine is not None:
+            yield from self._get_records_async(events, max_workers)
+        elif max_workers == 1:
+            for eventid, indexed_event in events:
+                items_per_page = self.page_size()
+                pages = self.get_event_record_pages(eventid, getattr(indexed_event, self.total_key), items_per_page,
+                                                    self._resume_page(eventid, items_per_page))
+                yield from self._track_event(eventid, indexed_event, items_per_page, pages)
+        else:
+            # Fetch up to max_workers events at once, but emit them strictly in index order.
+            # Each event reads ahead into its own buffer of prefetch_pages pages (at least
+            # one), so memory stays at max_workers * (prefetch_pages + 1) pages whatever the
+            # size of the events; an event behind the one being emitted waits for room.
+            depth = max(1, int(self.config.get("prefetch_pages", 2)))
+            pending = deque()
+            try:
+                for eventid, indexed_event in events:
+                    items_per_page = self.page_size()
+                    pages = self.get_event_pages(eventid, getattr(indexed_event, self.total_key), items_per_page,
+                                                 self._resume_page(eventid, items_per_page))
+                    pending.append((eventid, indexed_event, items_per_page, ReadAhead(self._cast_pages(eventid, pages), depth)))
+                    if len(pending) >= max_workers:
+                        eventid, indexed_event, items_per_page, pages = pending[0]
+                        yield from self._track_event(eventid, indexed_event, items_per_page, pages)
+                        pending.popleft()
+                while pending:
+                    eventid, indexed_event, items_per_page, pages = pending[0]
+                    yield from self._track_event(eventid, indexed_event, items_per_page, pages)
+                    pending.popleft()
+            finally:
+                # Stopped early (an error or a closed generator): release the events still reading ahead
+                for pending_event in pending:
+                    pending_event[3].close()
+        if checkpoint.get("eventid"):
+            # Its event was not among this run's: keep the offset for when it is
+            self.logger.warning(f"Interrupted {self.name} event {checkpoint['eventid']} was not synced; keeping its checkpoint.")
+        else:
+            # Finished cleanly: the next run starts from the per-event bookmarks alone
+            self.stream_state.pop("checkpoint", None)
+
+    def _get_records_async(self, events: Iterable[Tuple[int, IndexedEvent]],
+                           max_workers: int) -> Iterable[Dict[str, Any]]:
+        """Fetch up to max_workers events at once on the asyncio engine, emitting in index order.
+
+        All pages of an event with a known total are requested at once, so within the
+        engine's concurrency cap hundreds of pages can be in flight without a thread each.
+        """
+        from collections import deque
+        engine = self._tap.async_engine
+        pending = deque()
+        for eventid, indexed_event in events:
+            items_per_page = self.page_size()
+            pages = self._fetch_event_async(eventid, getattr(indexed_event, self.total_key), items_per_page,
+                                            self._resume_page(eventid, items_per_page))
+            pending.append((eventid, indexed_event, items_per_page, engine.submit(pages)))
+            if len(pending) >= max_workers:
+                eventid, indexed_event, items_per_page, future = pending.popleft()
+                yield from self._track_event(eventid, indexed_event, items_per_page,
+                                             self._cast_pages(eventid, future.result()))
+        while pending:
+            eventid, indexed_event, items_per_page, future = pending.popleft()
+            yield from self._track_event(eventid, indexed_event, items_per_page,
+                                         self._cast_pages(eventid, future.result()))
+
+    def get_partition_records(self, context: dict) -> Iterable[Dict[str, Any]]:
+        """Records of the single event named by a partition context."""
+        eventid = int(context["eventid"])
+        indexed_event = self._tap.get_event_index().get(eventid) or IndexedEvent(None, None, None, None)
+        if self.checkpoint(context).get("eventid") != eventid and not self.event_needs_sync(eventid, indexed_event, context):
+            return
+        items_per_page = self.page_size()
+        pages = self.get_event_record_pages(eventid, getattr(indexed_event, self.total_key), items_per_page,
+                                            self._resume_page(eventid, items_per_page, context))
+        yield from self._track_event(eventid, indexed_event, items_per_page, pages, context)
+        self.get_context_state(context).pop("checkpoint", None)
+
+    def _track_event(self, eventid: int, indexed_event: IndexedEvent, items_per_page: int,
+                     pages: Iterable[Tuple[int, List[Dict[str, Any]]]],
+                     context: Optional[dict] = None) -> Iterable[Dict[str, Any]]:
+        """Pass records through, checkpointing after each page and bookmarking the event at the end.
+
+        Code after a `yield` only runs once the SDK has written the record (or, when
+        batching, taken it for the current file), so each checkpoint covers records
+        that have actually been emitted.
+
+        With a fingerprint store, records whose hash matches the one stored for the
+        event's bookmarked token are counted but not emitted.
+        """
+        checkpoint = self.checkpoint(context)
+        store = self._tap.fingerprint_store
+        previous: Dict[int, bytes] = {}
+        hashes: Dict[int, bytes] = {}
+        if store is not None:
+            saved = self.event_bookmarks(context).get(str(eventid)) or {}
+            previous = store.load(self.name, eventid, saved.get("fingerprints"))
+        count = unchanged = 0
+        first_page = None
+        last_activity = last_activity_dt = None
+        emit_seconds = 0.0
+        for page_offset, records in pages:
+            if first_page is None:
+                first_page = page_offset
+            for record in records:
+                count += 1
+                for field in self.activity_fields:
+                    activity_dt = parse_timestamp(record.get(field))
+                    if activity_dt is not None and (last_activity_dt is None or activity_dt > last_activity_dt):
+                        last_activity, last_activity_dt = record.get(field), activity_dt
+                if store is not None and record.get("eventuserid") is not None:
+                    userid = int(record["eventuserid"])
+                    value = hashes[userid] = fingerprint(record)
+                    if previous.get(userid) == value:
+                        unchanged += 1
+                        continue
+                # Time suspended here is the SDK conforming, serializing and writing the record
+                started = time.perf_counter()
+                yield record
+                emit_seconds += time.perf_counter() - started
+            checkpoint.update({"eventid": eventid, "page_offset": page_offset + 1, "items_per_page": items_per_page})
+            self.maybe_checkpoint(pages=1)
+        saved = self.event_bookmarks(context).get(str(eventid)) or {}
+        in_index = eventid in self._tap.event_index
+        bookmark = {
+            # An event re-fetched for its recent activity alone is not in the index: keep what we knew
+            "lastupdated": indexed_event.lastupdated if in_index else saved.get("lastupdated"),
+            "total": getattr(indexed_event, self.total_key) if in_index else saved.get("total"),
+            "record_count": count,
+            "last_activity": last_activity,
+        }
+        if store is not None:
+            # A resumed event only saw its later pages: keep the hashes of the earlier ones
+            store.save(self.name, eventid, hashes, complete=not first_page)
+            bookmark["fingerprints"] = store.token
+        self.event_bookmarks(context)[str(eventid)] = bookmark
+        checkpoint.clear()
+        metrics = self._tap.metrics
+        metrics.increment(ON24Metric.RECORD_COUNT, count - unchanged, stream=self.name)
+        if unchanged:
+            metrics.increment(ON24Metric.UNCHANGED_RECORD_COUNT, unchanged, stream=self.name)
+        metrics.stage("emit", emit_seconds, stream=self.name)
+        if store is not None:
+            # The SDK only writes state after new records, and unchanged ones are not
+            # emitted. _finalize_state (same on every supported SDK; a no-op on this
+            # stream's state apart from that) marks it as unwritten, so the
+            # bookmarked fingerprint token still reaches the target
+            self._finalize_state(self.get_context_state(context))
+        self.maybe_checkpoint()
+
+    def maybe_checkpoint(self, pages: int = 0) -> None:
+        """Emit the checkpoint once `checkpoint_interval_seconds` (or `checkpoint_every_pages` pages) have passed.
+
+        Every STATE carries all per-event bookmarks, so writing one per page would make
+        STATE output grow with pages times events. The SDK still writes the final state.
+        """
+        self._pages_since_checkpoint += pages
+        every_pages = int(self.config.get("checkpoint_every_pages") or 0)
+        interval = float(self.config.get("checkpoint_interval_seconds", 30) or 0)
+        if (every_pages and self._pages_since_checkpoint >= every_pages) or \
+                time.monotonic() - self._last_checkpoint >= interval:
+            self.write_checkpoint()
+
+    def write_checkpoint(self) -> None:
+        """Emit the checkpoint now, unless batching: then the SDK emits state after each batch file."""
+        self._pages_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        if self.get_batch_config(self.config) is None:
+            self._write_state_message()
+
+    def get_batches(self, batch_config, context: Optional[dict] = None):
+        """Write records to size-capped JSONL files and emit only their manifests.
+
+        Records go through the stream's own RECORD pipeline (catalog projection, type
+        conformance, stream maps), so a batch file holds what RECORD messages would.
+        """
+        from tap_on24.batch import ON24JSONLBatcher
+        if batch_config.encoding.format != "jsonl":
+            yield from super().get_batches(batch_config, context)
+            return
+
+        def conformed(records):
+            for record in records:
+                # The first message is this stream's own map; records a map filters out are skipped
+                for message in self._generate_record_messages(record):
+                    yield message.record
                     break
 
-class ON24RegistrantsStream(Stream):
+        batcher = ON24JSONLBatcher(self.tap_name, self.name, batch_config,
+                                   max_bytes=self.config.get("batch_max_bytes"))
+        records = self._sync_records(context, write_messages=False)
+        for manifest in batcher.get_batches(conformed(records)):
+            yield batch_config.encoding, manifest
+
+    def get_event_record_pages(self, eventid: int, known_total: Optional[int] = None, items_per_page: int = 100,
+                               start_page: int = 0) -> Iterable[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (page_offset, records) for one event, coercing integer fields as we go."""
+        eventid = int(eventid)
+        if self.config.get("stream_json"):
+            # Records come off the socket one at a time; read-ahead would race the parser
+            for page_offset, records in self.get_event_pages(eventid, known_total, items_per_page, start_page):
+                yield page_offset, self._coerce_stream(records, eventid)
+            return
+        pages = prefetch(self.get_event_pages(eventid, known_total, items_per_page, start_page), int(self.config.get("prefetch_pages", 2)))
+        yield from self._cast_pages(eventid, pages)
+
+    def _cast_pages(self, eventid: int, pages: Iterable[Tuple[int, List[Dict[str, Any]]]]) -> Iterable[Tuple[int, List[Dict[str, Any]]]]:
+        coerce_page = self.coercer.coerce_page
+        metrics = self._tap.metrics
+        for page_offset, records in pages:
+            started = time.perf_counter()
+            for record in records:
+                record["eventid"] = eventid
+            # Cast integer fields per the schema, leaving pollanswers/surveyanswers arrays alone
+            records = coerce_page(records)
+            metrics.stage("cast", time.perf_counter() - started, stream=self.name)
+            yield page_offset, records
+
+    def _coerce_stream(self, records: Iterable[Dict[str, Any]], eventid: int) -> Iterable[Dict[str, Any]]:
+        coerce = self.coercer
+        parse_seconds = cast_seconds = 0.0
+        records = iter(records)
+        try:
+            while True:
+                # Pulling a streamed record reads and decodes it off the socket
+                started = time.perf_counter()
+                record = next(records, None)
+                decoded = time.perf_counter()
+                parse_seconds += decoded - started
+                if record is None:
+                    return
+                record["eventid"] = eventid
+                coerce(record)
+                cast_seconds += time.perf_counter() - decoded
+                yield record
+        finally:
+            self._tap.metrics.stage("parse", parse_seconds, stream=self.name)
+            self._tap.metrics.stage("cast", cast_seconds, stream=self.name)
+
+    def get_event_pages(self, eventid: int, known_total: Optional[int] = None, items_per_page: int = 100,
+                        start_page: int = 0) -> Iterable[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (page_offset, raw records) for one event, in pages of `items_per_page`, starting at `start_page`.
+
+        known_total (from eventanalytics) bounds the page count up front; the total
+        reported by the endpoint itself takes precedence once the first page arrives.
+        """
+        # ON24 API: itemsPerPage default 100, example 25; use min 10 per docs
+        items_per_page = max(10, items_per_page)
+        page_offset = start_page
+        total = known_total
+        if total is not None and page_offset * items_per_page >= total:
+            return
+        metrics = self._tap.metrics
+        pages = 0
+        while True:
+            data = self.fetch_page(eventid, items_per_page, page_offset)
+            records = data.get(self.records_key, [])
+            if not records:
+                break
+            pages += 1
+            # Projection is part of decoding a page (streamed pages project lazily)
+            started = time.perf_counter()
+            records = self.project_page(records)
+            metrics.stage("parse", time.perf_counter() - started, stream=self.name)
+            try:
+                yield page_offset, records
+            finally:
+                if isinstance(data, StreamedPage):
+                    # Already closed once read to the end; this releases the connection of a page left half-read
+                    data.close()
+            # Read after the records: a streamed page may only carry its total after the array
+            if page_offset == start_page and data.get(self.total_key) is not None:
+                total = data.get(self.total_key)
+            page_offset += 1
+            # Stop if we've fetched all records
+            if total is not None and (page_offset * items_per_page) >= total:
+                break
+        metrics.observe(ON24Metric.PAGES_PER_EVENT, pages, buckets=COUNT_BUCKETS, stream=self.name)
+
+    async def _fetch_event_async(self, eventid: int, known_total: Optional[int] = None, items_per_page: int = 100,
+                                 start_page: int = 0) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """get_event_pages as a coroutine: one event's pages, requested concurrently when possible.
+
+        With a known total, every page is requested at once. Otherwise the first page is
+        awaited for the endpoint's own total; without one, pages are requested one by
+        one until an empty page, as get_event_pages does.
+        """
+        import asyncio
+        items_per_page = max(10, items_per_page)
+        eventid = int(eventid)
+        metrics = self._tap.metrics
+
+        async def fetch(page_offset: int) -> Tuple[int, List[Dict[str, Any]], Optional[int]]:
+            data = await self.fetch_page_async(eventid, items_per_page, page_offset)
+            # Projection is part of decoding a page, as in get_event_pages
+            started = time.perf_counter()
+            records = self.project_page(data.get(self.records_key, []))
+            metrics.stage("parse", time.perf_counter() - started, stream=self.name)
+            return page_offset, records, data.get(self.total_key)
+
+        def page_count(total: int) -> int:
+            return -(-int(total) // items_per_page)
+
+        pages: List[Tuple[int, List[Dict[str, Any]]]] = []
+        total, first = known_total, start_page
+        if total is None:
+            page_offset, records, total = await fetch(start_page)
+            if records:
+                pages.append((page_offset, records))
+            if records and total is None:
+                # No total anywhere: one page at a time until an empty one
+                while records:
+                    page_offset, records, _ = await fetch(page_offset + 1)
+                    if records:
+                        pages.append((page_offset, records))
+            if not records or total is None:
+                metrics.observe(ON24Metric.PAGES_PER_EVENT, len(pages), buckets=COUNT_BUCKETS, stream=self.name)
+                return pages
+            first = start_page + 1
+        results = await asyncio.gather(*(fetch(page_offset) for page_offset in range(first, page_count(total))))
+        if known_total is not None and results and results[0][2] is not None:
+            # The endpoint's own total takes precedence over eventanalytics
+            reported = page_count(results[0][2])
+            results = [result for result in results if result[0] < reported]
+            results += await asyncio.gather(*(fetch(page_offset) for page_offset in range(page_count(known_total), reported)))
+        for page_offset, records, _ in results:
+            if not records:
+                break
+            pages.append((page_offset, records))
+        metrics.observe(ON24Metric.PAGES_PER_EVENT, len(pages), buckets=COUNT_BUCKETS, stream=self.name)
+        return pages
+
+class ON24AttendeesStream(ON24EventChildStream):
+    name = "attendees"
+    primary_keys = ["eventid", "eventuserid"]
+    records_key = "attendees"
+    total_key = "totalattendees"
+    activity_fields = ("lastliveactivity", "lastarchiveactivity")
+    schema = LazySchema("attendees")
+
+    def fetch_page(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        return self._tap.client_for_event(eventid).get_attendees(eventid, items_per_page, page_offset,
+                                                                 stream=bool(self.config.get("stream_json")))
+
+    async def fetch_page_async(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        return await self._tap.async_client_for_event(eventid).get_attendees(eventid, items_per_page, page_offset)
+
+class ON24RegistrantsStream(ON24EventChildStream):
     name = "registrants"
     primary_keys = ["eventid", "eventuserid"]
-    schema = th.PropertiesList(
-        th.Property("eventid", th.IntegerType),
-        th.Property("eventuserid", th.IntegerType),
-        th.Property("firstname", th.StringType),
-        th.Property("lastname", th.StringType),
-        th.Property("email", th.StringType),
-        th.Property("company", th.StringType),
-        th.Property("jobtitle", th.StringType),
-        th.Property("addressstreet1", th.StringType),
-        th.Property("addressstreet2", th.StringType),
-        th.Property("city", th.StringType),
-        th.Property("state", th.StringType),
-        th.Property("zip", th.StringType),
-        th.Property("country", th.StringType),
-        th.Property("workphone", th.StringType),
-        th.Property("jobfunction", th.StringType),
-        th.Property("companyindustry", th.StringType),
-        th.Property("companysize", th.StringType),
-        th.Property("partnerref", th.StringType),
-        th.Property("std1", th.StringType),
-        th.Property("std2", th.StringType),
-        th.Property("std3", th.StringType),
-        th.Property("std4", th.StringType),
-        th.Property("std5", th.StringType),
-        th.Property("std6", th.StringType),
-        th.Property("std7", th.StringType),
-        th.Property("std8", th.StringType),
-        th.Property("std9", th.StringType),
-        th.Property("std10", th.StringType),
-        th.Property("fax", th.StringType),
-        th.Property("username", th.StringType),
-        th.Property("exteventusercd", th.StringType),
-        th.Property("other", th.StringType),
-        th.Property("notes", th.StringType),
-        th.Property("marketingemail", th.StringType),
-        th.Property("eventemail", th.StringType),
-        th.Property("homephone", th.StringType),
-        th.Property("createtimestamp", th.StringType),
-        th.Property("lastactivity", th.StringType),
-        th.Property("browser", th.StringType),
-        th.Property("ipaddress", th.StringType),
-        th.Property("os", th.StringType),
-        th.Property("emailformat", th.StringType),
-        th.Property("engagementprediction", th.StringType),
-        th.Property("userprofileurl", th.StringType),
-        th.Property("campaigncode", th.StringType),
-        th.Property("sourcecampaigncode", th.StringType),
-        th.Property("sourceeventid", th.IntegerType),
-        th.Property("userstatus", th.StringType),
-        th.Property("utmsource", th.StringType),
-        th.Property("utmmedium", th.StringType),
-        th.Property("utmcampaign", th.StringType),
-        th.Property("utmterm", th.StringType),
-        th.Property("utmcontent", th.StringType),
-        th.Property("attendeetype", th.StringType),
-    ).to_dict()
-
-    def __init__(self, tap):
-        super().__init__(tap)
-        self.client = ON24Client(
-            tap.config.get("client_id"),
-            tap.config.get("access_token_key"),
-            tap.config.get("access_token_secret")
-        )
+    records_key = "registrants"
+    total_key = "totalregistrants"
+    activity_fields = ("lastactivity",)
+    schema = LazySchema("registrants")
 
-    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
-        import logging
-        # Get all eventids from the events stream
-        events_stream = self._tap.streams["events"]
-        for event_idx, event in enumerate(events_stream.get_records(context)):
-            eventid = event["eventid"]
-            # ON24 API: itemsPerPage default 100, example 25; use min 10 per docs
-            items_per_page = max(10, int(self.config.get("items_per_page") or 100))
-            page_offset = 0
-            total_registrants = None
-            while True:
-                data = self.client.get_registrants(eventid, items_per_page, page_offset)
-                registrants = data.get("registrants", [])
-                if total_registrants is None:
-                    total_registrants = data.get("totalregistrants")
-                if not registrants:
-                    break
-                for att_idx, registrant in enumerate(registrants):
-                    registrant["eventid"] = int(eventid)
-                    if "eventuserid" in registrant and registrant["eventuserid"] is not None:
-                        try:
-                            registrant["eventuserid"] = int(registrant["eventuserid"])
-                        except (ValueError, TypeError):
-                            registrant["eventuserid"] = None
-
-                    def cast_ids(obj):
-                        if isinstance(obj, dict):
-                            for k, v in obj.items():
-                                # Cast *_id fields to int
-                                if k.endswith("id") and v is not None:
-                                    try:
-                                        obj[k] = int(v)
-                                    except (ValueError, TypeError):
-                                        obj[k] = None
-                                # Recurse into lists and dicts, but do NOT convert pollanswers/surveyanswers
-                                elif isinstance(v, list) and k not in ("pollanswers", "surveyanswers"):
-                                    for item in v:
-                                        cast_ids(item)
-                                elif isinstance(v, dict):
-                                    cast_ids(v)
-                        elif isinstance(obj, list):
-                            for item in obj:
-                                cast_ids(item)
-
-                    # Cast *_id fields to int, preserve pollanswers/surveyanswers as arrays
-                    cast_ids(registrant)
-                    yield registrant
-                page_offset += 1
-                # Stop if we've fetched all registrants
-                if total_registrants is not None and (page_offset * items_per_page) >= total_registrants:
-                    break
+    def fetch_page(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        return self._tap.client_for_event(eventid).get_registrants(eventid, items_per_page, page_offset,
+                                                                   stream=bool(self.config.get("stream_json")))
+
+    async def fetch_page_async(self, eventid: int, items_per_page: int, page_offset: int) -> Dict[str, Any]:
+        return await self._tap.async_client_for_event(eventid).get_registrants(eventid, items_per_page, page_offset)
\ No newline at end of file
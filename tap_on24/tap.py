@@ -1,22 +1,446 @@
 """ON24 tap class."""
 
+import time
+import zlib
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import click
 from singer_sdk import Tap
-from singer_sdk.typing import PropertiesList, Property, StringType, IntegerType, BooleanType
+from singer_sdk.streams import Stream
+from singer_sdk.typing import PropertiesList, Property, StringType, IntegerType, BooleanType, NumberType, ArrayType, ObjectType
+from tap_on24.cassette import CACHE_MODES, ResponseCache
+from tap_on24.client import ON24Client
+from tap_on24.event_index import EventIndex
+from tap_on24.fingerprints import FingerprintStore
+from tap_on24.metrics import ON24Metric, RunMetrics
+from tap_on24.output import ON24SingerWriter
+from tap_on24.paging import MIN_ITEMS_PER_PAGE, PageSizer
+from tap_on24.planner import build_plan, load_manifest, log_plan, seed_index
+from tap_on24.schemas import read_cache, write_cache
 from tap_on24.streams import ON24EventsStream, ON24AttendeesStream, ON24RegistrantsStream
 
+if TYPE_CHECKING:
+    from tap_on24.async_client import AsyncEngine, AsyncON24Client
+    from tap_on24.profiling import RunProfiler
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse "i/N" into (i, N), with 0 <= i < N."""
+    try:
+        index, count = (int(part) for part in str(value).split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N (e.g. 0/4), got {value!r}.")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..N-1, got {value!r}.")
+    return index, count
+
 class TapON24(Tap):
     """Singer tap for ON24 Webinar Platform."""
     name = "tap-on24"
+    message_writer_class = ON24SingerWriter
 
     config_jsonschema = PropertiesList(
-        Property("client_id", StringType, required=True),
-        Property("access_token_key", StringType, required=True),
-        Property("access_token_secret", StringType, required=True),
+        Property("client_id", StringType, required=False),
+        Property("access_token_key", StringType, required=False),
+        Property("access_token_secret", StringType, required=False),
+        Property("clients", ArrayType(ObjectType(
+            Property("client_id", StringType, required=True),
+            Property("access_token_key", StringType, required=True),
+            Property("access_token_secret", StringType, required=True),
+        )), required=False),
         Property("on24_start_date", StringType, required=True),
         Property("on24_end_date", StringType, required=False),
         Property("items_per_page", IntegerType, default=100),
+        Property("adaptive_page_size", BooleanType, default=True),
+        Property("min_items_per_page", IntegerType, default=MIN_ITEMS_PER_PAGE),
+        Property("max_items_per_page", IntegerType, default=1000),
+        Property("target_page_seconds", NumberType, default=2),
+        Property("max_page_bytes", IntegerType, default=5 * 1024 * 1024),
+        Property("api_url", StringType, default="https://api.on24.com"),
+        Property("pool_maxsize", IntegerType, default=10),
+        Property("http_engine", StringType, default="requests", allowed_values=["requests", "asyncio"]),
+        Property("max_concurrent_requests", IntegerType, default=100),
+        Property("max_workers", IntegerType, default=1),
+        Property("prefetch_pages", IntegerType, default=2),
+        Property("stream_json", BooleanType, default=False),
+        Property("fast_output", BooleanType, default=False),
+        Property("batch_max_bytes", IntegerType, required=False),
+        Property("event_window_workers", IntegerType, default=1),
+        Property("max_pages_per_window", IntegerType, default=10),
+        Property("requests_per_second", NumberType, required=False),
+        Property("skip_empty_events", BooleanType, default=True),
+        Property("skip_test_events", BooleanType, default=False),
+        Property("activity_lookback_days", IntegerType, default=7),
+        Property("checkpoint_every_pages", IntegerType, required=False),
+        Property("checkpoint_interval_seconds", NumberType, default=30),
+        Property("partitioned", BooleanType, default=False),
+        Property("event_ids", ArrayType(IntegerType), required=False),
+        Property("event_id_min", IntegerType, required=False),
+        Property("event_id_max", IntegerType, required=False),
+        Property("shard", StringType, required=False),
+        Property("work_manifest", StringType, required=False),
+        Property("incremental_date_filter_mode", StringType, default="updated"),
+        Property("max_retries", IntegerType, default=5),
+        Property("request_timeout", NumberType, default=300),
+        Property("metrics_prometheus_path", StringType, required=False),
+        Property("metrics_json_path", StringType, required=False),
+        Property("cache_mode", StringType, default="off", allowed_values=list(CACHE_MODES)),
+        Property("cache_dir", StringType, default=".on24-cache"),
+        Property("cache_ttl_seconds", NumberType, default=86400),
+        Property("cache_max_bytes", IntegerType, default=1024 ** 3),
+        Property("fingerprint_store", StringType, required=False),
+        Property("fingerprint_retention_days", NumberType, default=90),
+        Property("fingerprint_max_bytes", IntegerType, default=1024 ** 3),
+        Property("profile_dir", StringType, required=False),
+        Property("profile_mode", StringType, default="sample", allowed_values=["sample", "cprofile"]),
+        Property("profile_interval_ms", NumberType, default=5),
+        Property("profile_top_n", IntegerType, default=30),
     ).to_dict()
 
+    # Set by the --shard CLI option; takes precedence over the `shard` setting
+    cli_shard: Optional[str] = None
+    # Set by the --plan CLI option: sync_all only plans
+    cli_plan: bool = False
+    # Set by the --profile CLI option; takes precedence over the `profile_dir` setting
+    cli_profile_dir: Optional[str] = None
+
+    @cached_property
+    def clients(self) -> Dict[str, ON24Client]:
+        """One ON24 client per configured client ID, shared by every stream of this tap."""
+        credentials = self.config.get("clients") or []
+        if self.config.get("client_id"):
+            credentials = [{
+                "client_id": self.config["client_id"],
+                "access_token_key": self.config.get("access_token_key"),
+                "access_token_secret": self.config.get("access_token_secret"),
+            }] + list(credentials)
+        if not credentials:
+            raise Exception("Either client_id/access_token_key/access_token_secret or clients must be configured.")
+        return {
+            str(creds["client_id"]): ON24Client(
+                str(creds["client_id"]),
+                creds["access_token_key"],
+                creds["access_token_secret"],
+                api_url=self.config.get("api_url"),
+                pool_maxsize=int(self.config.get("pool_maxsize") or 10),
+                requests_per_second=self.config.get("requests_per_second"),
+                max_retries=int(self.config.get("max_retries") or 5),
+                request_timeout=float(self.config.get("request_timeout") or 300),
+                metrics=self.metrics,
+                cache=self.response_cache,
+                page_sizers=self.page_sizers,
+            )
+            for creds in credentials
+        }
+
+    @property
+    def client(self) -> ON24Client:
+        """The first (usually only) configured client."""
+        return next(iter(self.clients.values()))
+
+    def client_id_for_event(self, eventid: int) -> str:
+        """The client ID whose /event listing returned `eventid` (the first client's if unknown)."""
+        indexed_event = self.event_index.get(int(eventid))
+        if indexed_event is not None and indexed_event.client_id in self.clients:
+            return indexed_event.client_id
+        return next(iter(self.clients))
+
+    def client_for_event(self, eventid: int) -> ON24Client:
+        return self.clients[self.client_id_for_event(eventid)]
+
+    @cached_property
+    def async_engine(self) -> Optional["AsyncEngine"]:
+        """The event loop thread driving the async clients, if http_engine is "asyncio"."""
+        if self.config.get("http_engine") != "asyncio":
+            return None
+        # Imported here: aiohttp alone takes longer to import than a short run takes
+        from tap_on24.async_client import AsyncEngine
+        return AsyncEngine()
+
+    @cached_property
+    def async_clients(self) -> Dict[str, "AsyncON24Client"]:
+        """An AsyncON24Client per configured client, sharing the sync clients' metrics, cache and page sizes."""
+        from tap_on24.async_client import AsyncON24Client
+        return {
+            client_id: AsyncON24Client(
+                client_id,
+                client.access_token_key,
+                client.access_token_secret,
+                api_url=self.config.get("api_url"),
+                max_concurrency=int(self.config.get("max_concurrent_requests") or 100),
+                requests_per_second=self.config.get("requests_per_second"),
+                max_retries=client.max_retries,
+                request_timeout=client.request_timeout,
+                metrics=self.metrics,
+                cache=self.response_cache,
+                page_sizers=self.page_sizers,
+            )
+            for client_id, client in self.clients.items()
+        }
+
+    def async_client_for_event(self, eventid: int) -> "AsyncON24Client":
+        return self.async_clients[self.client_id_for_event(eventid)]
+
+    @cached_property
+    def shard(self) -> Optional[Tuple[int, int]]:
+        """(index, count) of this process's shard, from --shard or the `shard` setting ("i/N")."""
+        value = self.cli_shard or self.config.get("shard")
+        return parse_shard(value) if value else None
+
+    @cached_property
+    def work_manifest(self) -> Optional[Dict[str, Any]]:
+        """The plan named by `work_manifest`, if any: it fixes which events child streams sync."""
+        path = self.config.get("work_manifest")
+        if not path:
+            return None
+        manifest = load_manifest(path)
+        items_per_page = int(self.config.get("items_per_page") or 100)
+        if manifest.get("items_per_page") != items_per_page:
+            self.logger.warning(f"Work manifest {path} was planned with items_per_page={manifest.get('items_per_page')}, "
+                                f"this run uses {items_per_page}: its page counts will not match.")
+        return manifest
+
+    @cached_property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The on-disk cassette cache shared by all clients, unless cache_mode is "off"."""
+        mode = self.config.get("cache_mode") or "off"
+        if mode == "off":
+            return None
+        cache = ResponseCache(
+            self.config.get("cache_dir") or ".on24-cache",
+            mode=mode,
+            ttl=self.config.get("cache_ttl_seconds"),
+            max_bytes=self.config.get("cache_max_bytes"),
+        )
+        self.logger.info(f"Response cache in {mode} mode at {cache.path}.")
+        return cache
+
+    @cached_property
+    def now(self) -> datetime:
+        """This run's clock; with a response cache, the one its cassettes were recorded at."""
+        now = time.time()
+        if self.response_cache is not None:
+            now = self.response_cache.clock(now)
+        return datetime.fromtimestamp(now, timezone.utc)
+
+    @cached_property
+    def fingerprint_store(self) -> Optional[FingerprintStore]:
+        """Hashes of emitted attendees/registrants, if `fingerprint_store` names a file."""
+        path = self.config.get("fingerprint_store")
+        if not path:
+            return None
+        self.logger.info(f"Only emitting new or changed attendees/registrants (fingerprints in {path}).")
+        return FingerprintStore(
+            path,
+            retention_days=self.config.get("fingerprint_retention_days"),
+            max_bytes=self.config.get("fingerprint_max_bytes"),
+        )
+
+    @cached_property
+    def profiler(self) -> Optional["RunProfiler"]:
+        """Per-stream profiles of get_records, if --profile or `profile_dir` names a directory."""
+        directory = self.cli_profile_dir or self.config.get("profile_dir")
+        if not directory:
+            return None
+        from tap_on24.profiling import RunProfiler
+        profiler = RunProfiler(
+            directory,
+            mode=self.config.get("profile_mode") or "sample",
+            interval=float(self.config.get("profile_interval_ms") or 5) / 1000,
+            top_n=int(self.config.get("profile_top_n") or 30),
+        )
+        self.logger.info(f"Profiling streams ({profiler.mode}) into {profiler.directory}.")
+        return profiler
+
+    def profile(self, stream_name: str):
+        """Context manager profiling the block as `stream_name`; a no-op unless profiling is on."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stream(stream_name)
+
+    @cached_property
+    def page_sizers(self) -> Dict[str, PageSizer]:
+        """itemsPerPage per endpoint, starting at items_per_page and adapted as pages come in.
+
+        Adaptation is off with a response cache: cassettes are keyed by itemsPerPage, so
+        sizes must repeat from run to run for replay to find them.
+        """
+        adaptive = bool(self.config.get("adaptive_page_size", True)) and self.response_cache is None
+        return {
+            endpoint: PageSizer(
+                endpoint,
+                int(self.config.get("items_per_page") or 100),
+                adaptive=adaptive,
+                minimum=int(self.config.get("min_items_per_page") or MIN_ITEMS_PER_PAGE),
+                maximum=int(self.config.get("max_items_per_page") or 1000),
+                target_seconds=float(self.config.get("target_page_seconds") or 2),
+                max_page_bytes=self.config.get("max_page_bytes"),
+            )
+            for endpoint in ("events", "attendees", "registrants")
+        }
+
+    @cached_property
+    def metrics(self) -> RunMetrics:
+        """Request, stage and throughput metrics for this run, shared by clients and streams."""
+        return RunMetrics()
+
+    @cached_property
+    def event_index(self) -> EventIndex:
+        """Events seen during this run, shared by the child streams."""
+        return EventIndex()
+
+    def get_event_index(self) -> EventIndex:
+        """Return the event index, paging through /event once if no stream has yet.
+
+        With a work manifest, the index comes from the manifest and /event is not called.
+        """
+        if not self.event_index.complete and self.work_manifest is not None:
+            seed_index(self.event_index, self.work_manifest)
+        if not self.event_index.complete:
+            for _ in self.streams["events"].get_records(None):
+                pass
+        return self.event_index
+
+    def event_in_slice(self, eventid: int) -> bool:
+        """Whether `eventid` belongs to the slice of events this tap process handles."""
+        event_ids = self.config.get("event_ids")
+        if event_ids and eventid not in event_ids:
+            return False
+        if self.config.get("event_id_min") is not None and eventid < self.config["event_id_min"]:
+            return False
+        if self.config.get("event_id_max") is not None and eventid > self.config["event_id_max"]:
+            return False
+        if self.shard is not None:
+            index, count = self.shard
+            # crc32 rather than hash(): stable across processes and machines
+            return zlib.crc32(str(eventid).encode()) % count == index
+        return True
+
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, on the buffered fast output path if fast_output is set.
+
+        Run metrics are reported at the end, also when the sync fails. With --plan,
+        nothing is synced: the plan is printed instead.
+
+        The SDK marks sync_all final but has no hook after the last stream (checked
+        for singer-sdk 0.45 to 0.54), and `invoke` builds the tap itself and calls
+        sync_all, so this is the only place for run-wide setup and cleanup. The
+        SDK's sync itself always runs unchanged through super().
+        """
+        if self.cli_plan:
+            self.run_plan()
+            return
+        writer = self.message_writer
+        fast_writer = isinstance(writer, ON24SingerWriter)
+        if fast_writer:
+            writer.fast = bool(self.config.get("fast_output"))
+        try:
+            super().sync_all()
+        finally:
+            if fast_writer:
+                writer.flush()
+            if self.async_engine is not None:
+                self.async_engine.close(*self.async_clients.values())
+            if self.fingerprint_store is not None:
+                self.fingerprint_store.compact()
+                self.fingerprint_store.close()
+            if self.profiler is not None:
+                self.profiler.write()
+            self.report_metrics()
+
+    def report_metrics(self) -> None:
+        """Log the run metrics as SDK metric lines and write the optional Prometheus/JSON files."""
+        for endpoint, sizer in self.page_sizers.items():
+            self.metrics.set_gauge(ON24Metric.PAGE_SIZE_CURRENT, sizer.size, endpoint=endpoint)
+        self.metrics.log()
+        try:
+            self.metrics.write(self.config.get("metrics_prometheus_path"), self.config.get("metrics_json_path"))
+        except OSError as e:
+            self.logger.warning(f"Could not write run metrics: {e}")
+
+    def run_plan(self) -> Dict[str, Any]:
+        """Dry run: page /event only, log the plan and write it to stdout as JSON (a work manifest)."""
+        plan = build_plan(self)
+        log_plan(plan, self.logger)
+        self.message_writer.write_document(plan)
+        return plan
+
+    @property
+    def catalog_dict(self) -> dict:
+        """The discovered catalog, from the on-disk cache for this package version when there is one.
+
+        Discovery doesn't depend on config, so only a catalog passed in with --catalog
+        (applied to the streams) bypasses the cache.
+        """
+        if self.input_catalog is not None:
+            return super().catalog_dict
+        catalog = read_cache("catalog")
+        if catalog is None:
+            catalog = super().catalog_dict
+            write_cache("catalog", catalog)
+        return catalog
+
+    @property
+    def streams(self) -> Dict[str, Stream]:
+        """The SDK's streams with events first, so it is synced before its dependents and /event is paged once.
+
+        The SDK orders streams by name and syncs them in that order; load_streams is
+        final, so the order is applied here.
+        """
+        return dict(sorted(super().streams.items(), key=lambda item: item[0] != "events"))
+
+    @classmethod
+    def cb_shard(cls, ctx: click.Context, param: click.Option, value: Optional[str]) -> None:
+        """CLI callback for --shard i/N."""
+        if value:
+            try:
+                parse_shard(value)
+            except ValueError as e:
+                raise click.BadParameter(str(e))
+            cls.cli_shard = value
+
+    @classmethod
+    def cb_plan(cls, ctx: click.Context, param: click.Option, value: bool) -> None:
+        """CLI callback for --plan."""
+        if value:
+            cls.cli_plan = True
+
+    @classmethod
+    def cb_profile(cls, ctx: click.Context, param: click.Option, value: Optional[str]) -> None:
+        """CLI callback for --profile DIR."""
+        if value:
+            cls.cli_profile_dir = value
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        command = super().get_singer_command()
+        command.params.append(click.Option(
+            ["--shard"],
+            help="Only sync shard i of N (e.g. 0/4): events are hash-partitioned by eventid.",
+            callback=cls.cb_shard,
+            expose_value=False,
+            is_eager=True,
+        ))
+        command.params.append(click.Option(
+            ["--plan"],
+            is_flag=True,
+            help="Page /event only and print the requests, pages and runtime a sync would need, as a JSON work manifest.",
+            callback=cls.cb_plan,
+            expose_value=False,
+            is_eager=True,
+        ))
+        command.params.append(click.Option(
+            ["--profile"],
+            metavar="DIR",
+            help="Profile each stream's sync and write the profiles and a hot-function summary per stream to DIR.",
+            callback=cls.cb_profile,
+            expose_value=False,
+            is_eager=True,
+        ))
+        return command
+
     def discover_streams(self):
         """Return a list of discovered streams."""
         return [ON24EventsStream(self), ON24AttendeesStream(self), ON24RegistrantsStream(self)]
\ No newline at end of file
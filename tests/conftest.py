@@ -0,0 +1,51 @@
+"""A synthetic ON24 API (benchmarks/mock_server.py) and a helper that syncs the tap against it."""
+
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from mock_server import MockConfig, MockON24Server  # noqa: E402
+
+from tap_on24.tap import TapON24  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def on24_server():
+    config = MockConfig(events=6, attendees_per_event=130, registrants_per_event=70, empty_event_ratio=0,
+                        start_date="2025-01-01", days=30)
+    with MockON24Server(config) as server:
+        yield server
+
+
+@pytest.fixture
+def run_sync(on24_server):
+    """Sync the tap against the mock API: returns (RECORD messages, last STATE value, error raised)."""
+
+    def run(state: Optional[Dict[str, Any]] = None,
+            **config: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Optional[Exception]]:
+        config = {
+            "client_id": "1", "access_token_key": "key", "access_token_secret": "secret",
+            "api_url": on24_server.url, "on24_start_date": "2025-01-01", "on24_end_date": "2025-03-01",
+            "items_per_page": 50, "adaptive_page_size": False, "backoff_base": 0, "max_retries": 0,
+            **config,
+        }
+        out = io.StringIO()
+        error = None
+        with contextlib.redirect_stdout(out):
+            try:
+                TapON24(config=config, state=state or {}).sync_all()
+            except Exception as e:
+                error = e
+        messages = [json.loads(line) for line in out.getvalue().splitlines()]
+        records = [m for m in messages if m["type"] == "RECORD"]
+        states = [m["value"] for m in messages if m["type"] == "STATE"]
+        return records, states[-1] if states else state or {}, error
+
+    return run
@@ -0,0 +1,88 @@
+"""ON24Client: retries and backoff, and streamed pages when the connection drops mid-body."""
+
+import io
+import json
+
+import pytest
+import requests
+
+from tap_on24.client import ON24Client, Retry
+from tap_on24.metrics import ON24Metric
+
+RECORDS = [{"eventuserid": i, "email": f"u{i}@example.com"} for i in range(50)]
+BODY = json.dumps({"currentpage": 0, "attendees": RECORDS, "totalattendees": len(RECORDS)}).encode()
+
+
+class DroppingRaw(io.BytesIO):
+    def __init__(self, body: bytes, drop_after: int):
+        super().__init__(body)
+        self.drop_after = drop_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.drop_after:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken: IncompleteRead")
+        return super().read(min(size, self.drop_after - self.tell()))
+
+
+def make_response(raw) -> requests.Response:
+    r = requests.Response()
+    r.raw = raw
+    r.encoding = "utf-8"
+    r.status_code = 200
+    return r
+
+
+def client_with(responses) -> ON24Client:
+    client = ON24Client("1", "key", "secret", backoff_base=0, backoff_max=0, max_retries=3)
+    sent = []
+
+    def get(url, params=None, **kwargs):
+        sent.append(dict(params))
+        return make_response(responses.pop(0))
+
+    client.session.get = get
+    client.sent = sent
+    return client
+
+
+def test_streamed_page_is_requested_again_after_a_drop():
+    first = DroppingRaw(BODY, len(BODY) // 2)
+    client = client_with([first, io.BytesIO(BODY)])
+    page = client.get_attendees(7, items_per_page=50, page_offset=3, stream=True)
+    assert list(page.get("attendees")) == RECORDS
+    assert page.get("totalattendees") == len(RECORDS)
+    # The same page, twice, and the dropped connection was released
+    assert client.sent == [{"itemsPerPage": 50, "pageOffset": 3}] * 2
+    assert first.closed
+    assert client.metrics.total(ON24Metric.HTTP_REQUEST_COUNT, endpoint="attendees") == 2
+
+
+def test_streamed_page_fails_once_out_of_retries():
+    client = client_with([DroppingRaw(BODY, 100) for _ in range(4)])
+    page = client.get_attendees(7, items_per_page=50, stream=True)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        list(page.get("attendees"))
+    assert len(client.sent) == 1 + client.max_retries
+
+
+def test_retry_backoff_and_give_up():
+    client = ON24Client("1", "key", "secret", backoff_base=0.5, backoff_max=2, max_retries=3)
+    retry = Retry(client, "attendees (event 7, page 0)", "attendees")
+    first = retry.failed(0, 503, "503", None)
+    assert 0.5 <= first <= 1.5
+    # Retry-After wins over the jitter, capped at backoff_max
+    assert 2 <= retry.failed(1, 500, "500", 30) <= 2.5
+    assert retry.failed(2, None, "ConnectionError", None) is None
+    assert retry.errors == 3
+    assert str(retry.exhausted()) == "Max retries exceeded for attendees (event 7, page 0): ConnectionError."
+
+
+def test_retry_throttling_pauses_the_whole_client():
+    client = ON24Client("1", "key", "secret", backoff_base=0.01, max_retries=2)
+    retry = Retry(client, "events (page 0)", "events")
+    assert retry.failed(0, 429, "429", 5) == 0.0
+    assert client.rate_limiter.blocked_until > 0
+    assert retry.errors == 0
+    assert client.metrics.total(ON24Metric.HTTP_THROTTLED_COUNT, endpoint="events") == 1
+    assert retry.failed(1, 429, "429", None) is None
+    assert "throttling" in str(retry.exhausted())
@@ -0,0 +1,102 @@
+"""RecordCoercer against the legacy cast_ids walk it replaced, on records built from the schemas."""
+
+import copy
+
+import pytest
+
+from tap_on24.coercion import RecordCoercer, schema_types
+from tap_on24.schemas import load_schema
+
+# The documented type changes (README "Output"): paths as field names joined by "."
+STRING_NOW = {"surveys.surveyid"}
+INTEGER_NOW = {
+    "liveminutes", "liveviewed", "archiveminutes", "archiveviewed", "askedquestions", "resourcesdownloaded",
+    "answeredpolls", "answeredsurveys", "answeredsurveyquestions", "cumulativeliveminutes",
+    "cumulativearchiveminutes", "attendeesessions", "livemediaplayerminutes", "archivemediaplayerminutes",
+    "locationvisits.visits", "locationvisits.visitsduration", "locationvisits.cumulativevisitsduration",
+}
+
+
+def legacy_cast_ids(obj):
+    """The per-record cast the attendee/registrant loops ran before RecordCoercer."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k.endswith("id") and v is not None:
+                try:
+                    obj[k] = int(v)
+                except (ValueError, TypeError):
+                    obj[k] = None
+            elif isinstance(v, list) and k not in ("pollanswers", "surveyanswers"):
+                for item in v:
+                    legacy_cast_ids(item)
+            elif isinstance(v, dict):
+                legacy_cast_ids(v)
+    elif isinstance(obj, list):
+        for item in obj:
+            legacy_cast_ids(item)
+
+
+def sample(schema, n=0):
+    """A record as ON24 sends it: numbers as strings, two items in every array."""
+    types = schema_types(schema)
+    if "object" in types:
+        return {key: sample(prop, n) for key, prop in (schema.get("properties") or {}).items()}
+    if "array" in types:
+        return [sample(schema.get("items") or {}, n + i) for i in range(2)]
+    if "boolean" in types:
+        return True
+    if "integer" in types or "number" in types:
+        return str(n + 7)
+    return str(n)
+
+
+def diff(old, new, path=()):
+    """Yield (dotted path, old, new) wherever the two outputs differ."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            yield from diff(old[key], new[key], path + (key,))
+    elif isinstance(old, list) and isinstance(new, list):
+        for a, b in zip(old, new):
+            yield from diff(a, b, path)
+    elif old != new or type(old) is not type(new):
+        yield ".".join(path), old, new
+
+
+@pytest.mark.parametrize("stream", ["attendees", "registrants"])
+def test_only_the_documented_fields_change(stream):
+    schema = load_schema(stream)
+    record = sample(schema)
+    old = copy.deepcopy(record)
+    legacy_cast_ids(old)
+    new = RecordCoercer(schema)(copy.deepcopy(record))
+    changed = {}
+    for path, before, after in diff(old, new):
+        changed.setdefault(path, set()).add((type(before), type(after)))
+    expected = (STRING_NOW | INTEGER_NOW) if stream == "attendees" else set()
+    assert set(changed) == expected
+    for path in STRING_NOW & set(changed):
+        assert changed[path] == {(int, str)}
+    for path in INTEGER_NOW & set(changed):
+        assert changed[path] == {(str, int)}
+
+
+def test_sample_values():
+    schema = load_schema("attendees")
+    record = {"eventid": "12", "eventuserid": "100", "liveminutes": "42", "email": "a@example.com",
+              "surveys": [{"surveyid": "0", "surveyquestions": [{"surveyquestionid": "5", "surveyanswers": ["1", "x"]}]}],
+              "locationvisits": [{"visits": "3"}]}
+    old = copy.deepcopy(record)
+    legacy_cast_ids(old)
+    new = RecordCoercer(schema)(copy.deepcopy(record))
+    assert old["surveys"][0]["surveyid"] == 0 and new["surveys"][0]["surveyid"] == "0"
+    assert old["liveminutes"] == "42" and new["liveminutes"] == 42
+    assert new["locationvisits"] == [{"visits": 3}]
+    # Unchanged: ids the schema declares as integers, and string answer arrays
+    for out in (old, new):
+        assert out["eventid"] == 12 and out["eventuserid"] == 100
+        assert out["surveys"][0]["surveyquestions"][0] == {"surveyquestionid": 5, "surveyanswers": ["1", "x"]}
+
+
+def test_unparseable_integers_become_none():
+    new = RecordCoercer(load_schema("attendees"))({"eventuserid": "n/a", "liveminutes": "", "email": "a@example.com"})
+    assert new["eventuserid"] is None and new["liveminutes"] is None
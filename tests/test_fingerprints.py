@@ -0,0 +1,56 @@
+"""FingerprintStore: hashes are only trusted under the token bookmarked with them."""
+
+from tap_on24.fingerprints import FingerprintStore, fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_load_requires_matching_token(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fp.db"))
+    hashes = {1: fingerprint({"id": 1}), 2: fingerprint({"id": 2})}
+    store.save("attendees", 100, hashes)
+    assert store.load("attendees", 100, store.token) == hashes
+    assert store.load("attendees", 100, None) == {}
+    assert store.load("attendees", 100, "stale") == {}
+    assert store.load("registrants", 100, store.token) == {}
+
+    # A later run writes under its own token: the earlier one no longer matches
+    token = store.token
+    store.close()
+    store = FingerprintStore(str(tmp_path / "fp.db"))
+    store.save("attendees", 100, {1: hashes[1]})
+    assert store.load("attendees", 100, token) == {}
+    assert store.load("attendees", 100, store.token) == {1: hashes[1]}
+
+
+def test_incomplete_save_keeps_earlier_pages(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fp.db"))
+    store.save("attendees", 100, {1: b"a" * 8, 2: b"b" * 8})
+    store.save("attendees", 100, {2: b"c" * 8}, complete=False)
+    assert store.load("attendees", 100, store.token) == {1: b"a" * 8, 2: b"c" * 8}
+    store.save("attendees", 100, {2: b"c" * 8})
+    assert store.load("attendees", 100, store.token) == {2: b"c" * 8}
+
+
+def test_sync_skips_unchanged_records_until_token_is_lost(run_sync, tmp_path):
+    path = str(tmp_path / "fp.db")
+    first, state, error = run_sync(fingerprint_store=path, activity_lookback_days=100000)
+    assert error is None
+    children = sum(m["stream"] != "events" for m in first)
+    assert children > 0
+
+    # Every event is re-fetched (still "active"), but no record changed
+    second, state, error = run_sync(state, fingerprint_store=path, activity_lookback_days=100000)
+    assert error is None
+    assert [m for m in second if m["stream"] != "events"] == []
+
+    # A STATE that never recorded the tokens (e.g. the target didn't confirm it) re-emits in full
+    for stream in ("attendees", "registrants"):
+        for bookmark in state["bookmarks"][stream]["event_bookmarks"].values():
+            bookmark.pop("fingerprints")
+    third, _, error = run_sync(state, fingerprint_store=path, activity_lookback_days=100000)
+    assert error is None
+    assert sum(m["stream"] != "events" for m in third) == children
@@ -0,0 +1,21 @@
+"""RunMetrics exposition: every Prometheus family is declared once."""
+
+from collections import Counter
+
+from tap_on24.metrics import PAGE_SIZE_BUCKETS, ON24Metric, RunMetrics
+
+
+def test_prometheus_families_are_unique():
+    metrics = RunMetrics()
+    metrics.increment(ON24Metric.HTTP_REQUEST_COUNT, endpoint="attendees", status=200)
+    metrics.observe(ON24Metric.PAGE_SIZE, 100, buckets=PAGE_SIZE_BUCKETS, endpoint="attendees")
+    metrics.observe(ON24Metric.PAGE_SIZE, 200, buckets=PAGE_SIZE_BUCKETS, endpoint="registrants")
+    metrics.set_gauge(ON24Metric.PAGE_SIZE_CURRENT, 200, endpoint="attendees")
+    metrics.set_gauge(ON24Metric.PAGE_SIZE_CURRENT, 400, endpoint="registrants")
+    text = metrics.to_prometheus()
+    declared = Counter(line.split()[2] for line in text.splitlines() if line.startswith("# TYPE"))
+    assert max(declared.values()) == 1
+    assert 'tap_on24_page_size_current{endpoint="registrants"} 400' in text
+    assert 'tap_on24_page_size_count{endpoint="attendees"} 1' in text
+    gauges = {item["metric"]: item["value"] for item in metrics.summary()["gauges"] if item["tags"] == {"endpoint": "attendees"}}
+    assert gauges == {"page_size_current": 200}
@@ -0,0 +1,70 @@
+"""PageSizer: bounds, step sizes and when a size may grow or must shrink."""
+
+from tap_on24.paging import MIN_ITEMS_PER_PAGE, PageSizer
+
+
+def test_bounds_are_clamped():
+    sizer = PageSizer("attendees", initial=5000, minimum=1, maximum=500)
+    assert (sizer.minimum, sizer.maximum, sizer.size) == (MIN_ITEMS_PER_PAGE, 500, 500)
+    assert PageSizer("attendees", initial=1).size == MIN_ITEMS_PER_PAGE
+    assert PageSizer("attendees", initial=100, minimum=200, maximum=50).maximum == 200
+
+
+def test_fixed_size_when_not_adaptive():
+    sizer = PageSizer("attendees", initial=100, adaptive=False)
+    sizer.observe(100, 100, seconds=0.01, nbytes=1000)
+    sizer.observe(100, 100, seconds=60, nbytes=1000, errors=1)
+    assert sizer.size == 100
+
+
+def test_grows_at_most_twofold_per_page_up_to_maximum():
+    sizer = PageSizer("attendees", initial=100, maximum=1000)
+    sizes = []
+    for _ in range(6):
+        # Fast pages: the time target alone would allow 20000 records
+        sizer.observe(sizer.size, sizer.size, seconds=sizer.size * 0.0001, nbytes=sizer.size * 100)
+        sizes.append(sizer.size)
+    assert sizes == [200, 400, 800, 1000, 1000, 1000]
+
+
+def test_shrinks_at_most_by_half_down_to_minimum():
+    sizer = PageSizer("attendees", initial=800, minimum=50)
+    sizes = []
+    for _ in range(6):
+        sizer.observe(sizer.size, sizer.size, seconds=sizer.size * 1.0, nbytes=sizer.size * 100)
+        sizes.append(sizer.size)
+    assert sizes == [400, 200, 100, 50, 50, 50]
+
+
+def test_sizes_are_multiples_of_ten_within_target():
+    sizer = PageSizer("attendees", initial=100, target_seconds=2.0)
+    # 0.0137 s/record: 2 s is about 146 records
+    sizer.observe(100, 100, seconds=1.37, nbytes=10000)
+    assert sizer.size == 140
+    # Within 25% of the target: no change
+    sizer.observe(140, 140, seconds=140 * 0.0137 * 0.9, nbytes=14000)
+    assert sizer.size == 140
+
+
+def test_short_page_does_not_grow():
+    sizer = PageSizer("attendees", initial=100)
+    sizer.observe(100, 30, seconds=0.003, nbytes=3000)
+    assert sizer.size == 100
+
+
+def test_page_bytes_cap():
+    sizer = PageSizer("attendees", initial=100, max_page_bytes=50000)
+    # Fast, but 1000 bytes per record: 50 records fill a page
+    sizer.observe(100, 100, seconds=0.01, nbytes=100000)
+    assert sizer.size == 50
+
+
+def test_errors_halve_the_size():
+    sizer = PageSizer("attendees", initial=400, max_error_rate=0.1)
+    # Pages on target (2 s), so only the errors move the size
+    sizer.observe(400, 400, seconds=2.0, nbytes=4000)
+    assert sizer.size == 400
+    sizer.observe(400, 400, seconds=2.0, nbytes=4000, errors=1)
+    assert sizer.size == 200
+    sizer.observe(200, 200, seconds=1.0, nbytes=2000, errors=1)
+    assert sizer.size == 100
@@ -0,0 +1,62 @@
+"""ReadAhead / prefetch: bounded buffering, errors and early close."""
+
+import time
+
+import pytest
+
+from tap_on24.prefetch import ReadAhead, prefetch
+
+
+def counted(n: int, produced: list, fail_at: int = -1):
+    for i in range(n):
+        if i == fail_at:
+            raise RuntimeError(f"page {i} failed")
+        produced.append(i)
+        yield i
+
+
+def settle(produced: list) -> int:
+    # Let the producer run until it blocks on the full buffer
+    for _ in range(50):
+        before = len(produced)
+        time.sleep(0.01)
+        if len(produced) == before:
+            break
+    return len(produced)
+
+
+@pytest.mark.parametrize("depth", [1, 2, 5])
+def test_read_ahead_is_bounded(depth):
+    produced = []
+    reader = ReadAhead(counted(100, produced), depth)
+    # Started without being iterated, and stops after `depth` buffered pages plus the one it holds
+    assert settle(produced) == depth + 1
+    assert next(reader) == 0
+    assert settle(produced) == depth + 2
+    assert list(reader) == list(range(1, 100))
+    reader.close()
+
+
+def test_errors_reach_the_consumer():
+    reader = ReadAhead(counted(10, [], fail_at=3), 2)
+    assert [next(reader) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(RuntimeError, match="page 3"):
+        next(reader)
+    assert list(reader) == []
+
+
+def test_close_releases_the_producer():
+    produced = []
+    reader = ReadAhead(counted(100, produced), 1)
+    settle(produced)
+    reader.close()
+    reader._thread.join(timeout=2)
+    assert not reader._thread.is_alive()
+    assert len(produced) < 100
+
+
+def test_prefetch_depth_zero_is_inline():
+    produced = []
+    pages = prefetch(counted(5, produced), 0)
+    assert produced == []
+    assert list(pages) == [0, 1, 2, 3, 4]
@@ -0,0 +1,84 @@
+"""Retry-After parsing and the client-side token bucket."""
+
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from tap_on24.client import TokenBucket, parse_retry_after
+
+
+def response_with(**headers) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 429
+    r.headers.update({name.replace("_", "-"): value for name, value in headers.items()})
+    return r
+
+
+def test_retry_after_seconds():
+    assert parse_retry_after(response_with(Retry_After="7")) == 7.0
+    assert parse_retry_after(response_with(Retry_After="1.5")) == 1.5
+    assert parse_retry_after(response_with(Retry_After="-3")) == 0.0
+
+
+def test_retry_after_http_date():
+    wait = parse_retry_after(response_with(Retry_After=formatdate(time.time() + 30, usegmt=True)))
+    assert 28 <= wait <= 30
+    assert parse_retry_after(response_with(Retry_After=formatdate(time.time() - 30, usegmt=True))) == 0.0
+
+
+def test_rate_limit_headers():
+    # X-RateLimit-Reset is a delta in seconds or an epoch timestamp
+    assert parse_retry_after(response_with(X_RateLimit_Remaining="0", X_RateLimit_Reset="12")) == 12.0
+    wait = parse_retry_after(response_with(X_RateLimit_Remaining="0", X_RateLimit_Reset=str(time.time() + 20)))
+    assert 19 <= wait <= 20
+    assert parse_retry_after(response_with(X_RateLimit_Remaining="5", X_RateLimit_Reset="12")) is None
+
+
+def test_no_or_unparseable_headers():
+    assert parse_retry_after(response_with()) is None
+    assert parse_retry_after(response_with(Retry_After="soon")) is None
+    assert parse_retry_after(response_with(X_RateLimit_Remaining="0")) is None
+    # An unusable Retry-After falls back to the X-RateLimit headers
+    assert parse_retry_after(response_with(Retry_After="soon", X_RateLimit_Remaining="0", X_RateLimit_Reset="4")) == 4.0
+
+
+def test_bucket_without_rate_never_waits():
+    bucket = TokenBucket(None)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+
+
+def test_bucket_burst_then_rate(monkeypatch):
+    clock = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "sleep", sleep)
+    bucket = TokenBucket(rate=10, burst=5)
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.acquire() == pytest.approx(0.1)
+    clock[0] += 10
+    # Idle time refills up to the burst, not beyond
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    assert bucket.acquire() > 0
+    assert sum(sleeps) == pytest.approx(0.3)
+
+
+def test_bucket_pause_holds_every_caller(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    bucket = TokenBucket(None)
+    bucket.pause(2.5)
+    assert bucket.acquire() == pytest.approx(2.5)
+    assert bucket.acquire() == 0.0
+    # A shorter pause doesn't cut an earlier, longer one short
+    bucket.pause(5)
+    bucket.pause(1)
+    assert bucket.acquire() == pytest.approx(5)
@@ -0,0 +1,51 @@
+"""Resuming a sync from the checkpoint of an event it was interrupted in."""
+
+from tap_on24 import streams
+
+# 6 events of 130 attendees and 70 registrants in the mock API
+ATTENDEES = 6 * 130
+REGISTRANTS = 6 * 70
+
+
+def child_keys(records):
+    return [(m["stream"], m["record"]["eventid"], m["record"]["eventuserid"])
+            for m in records if m["stream"] != "events"]
+
+
+def test_resume_mid_event(run_sync, monkeypatch):
+    fetch_page = streams.ON24AttendeesStream.fetch_page
+    calls = []
+
+    def failing(self, *args, **kwargs):
+        # 3 pages of 50 per event: fail on the second page of the third event
+        calls.append(args)
+        if len(calls) > 7:
+            raise Exception("503 Service Unavailable")
+        return fetch_page(self, *args, **kwargs)
+
+    monkeypatch.setattr(streams.ON24AttendeesStream, "fetch_page", failing)
+    first, state, error = run_sync(checkpoint_every_pages=1)
+    assert error is not None
+    checkpoint = dict(state["bookmarks"]["attendees"]["checkpoint"])
+    assert checkpoint["page_offset"] == 1
+
+    monkeypatch.setattr(streams.ON24AttendeesStream, "fetch_page", fetch_page)
+    second, state, error = run_sync(state, checkpoint_every_pages=1)
+    assert error is None
+    assert "checkpoint" not in state["bookmarks"]["attendees"]
+
+    keys = child_keys(first) + child_keys(second)
+    assert len(keys) == len(set(keys))
+    assert sum(stream == "attendees" for stream, _, _ in set(keys)) == ATTENDEES
+    assert sum(stream == "registrants" for stream, _, _ in set(keys)) == REGISTRANTS
+    # The interrupted event is finished first, from the page after its checkpoint
+    resumed = child_keys(second)[:130 - 50]
+    assert {key[:2] for key in resumed} == {("attendees", checkpoint["eventid"])}
+
+
+def test_resync_skips_bookmarked_events(run_sync):
+    _, state, error = run_sync()
+    assert error is None
+    records, _, error = run_sync(state)
+    assert error is None
+    assert child_keys(records) == []
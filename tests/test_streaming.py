@@ -0,0 +1,206 @@
+"""StreamedPage against whole-body json.loads, with the body cut into tiny chunks."""
+
+import io
+import json
+import random
+
+import pytest
+import requests
+
+from tap_on24.streaming import StreamedPage
+
+CHUNK_SIZES = range(1, 8)
+
+RECORDS = [
+    {"eventuserid": 1, "email": "plain@example.com", "engagementscore": 5.5},
+    {"eventuserid": -2, "email": "café ☃ \U0001F600", "score": 1.5e-3, "ok": True, "none": None},
+    {"eventuserid": 30000000000, "quote": "say \"hi\" \\ back\nslash /", "tags": ["a", "b", []]},
+    {"eventuserid": 4, "surveys": [{"surveyid": "7", "surveyanswers": ["Very", "über"]}], "empty": {}},
+]
+
+
+def response(body: bytes, encoding: str = "utf-8") -> requests.Response:
+    r = requests.Response()
+    r.raw = io.BytesIO(body)
+    r.encoding = encoding
+    r.status_code = 200
+    return r
+
+
+def page(document, chunk_size: int, records_key: str = "attendees", **kwargs) -> StreamedPage:
+    return StreamedPage(response(json.dumps(document, ensure_ascii=False).encode()), records_key,
+                        chunk_size=chunk_size, **kwargs)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_records_and_fields_around_the_array(chunk_size):
+    document = {"currentpage": 0, "note": "before é", "attendees": RECORDS, "totalattendees": 1234, "after": [1.25, -3]}
+    streamed = page(document, chunk_size)
+    # Fields before the array are decoded up front
+    assert streamed.get("currentpage") == 0
+    assert streamed.get("note") == "before é"
+    assert streamed.get("totalattendees") is None
+    assert list(streamed.get("attendees")) == RECORDS
+    # Fields after it once the records have been read
+    assert streamed.get("totalattendees") == 1234
+    assert streamed.get("after") == [1.25, -3]
+    assert streamed.count == len(RECORDS)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_escaped_unicode_splits(chunk_size):
+    # \uXXXX escapes and raw multi-byte UTF-8 both straddle chunk edges at these sizes
+    body = b'{"attendees": [{"a": "\\u00e9\\ud83d\\ude00\\"", "b": "\xc3\xa9\xf0\x9f\x98\x80"}], "totalattendees": 1}'
+    streamed = StreamedPage(response(body), "attendees", chunk_size=chunk_size)
+    assert list(streamed) == [{"a": "é\U0001F600\"", "b": "é\U0001F600"}]
+    assert streamed.get("totalattendees") == 1
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_numbers_cut_at_chunk_edges(chunk_size):
+    records = [{"n": value} for value in (0, 7, -15, 3.25, 123456789012, 1e21, -2.5e-7)]
+    assert list(page({"attendees": records}, chunk_size)) == records
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_empty_and_missing_arrays(chunk_size):
+    streamed = page({"totalattendees": 0, "attendees": [], "currentpage": 3}, chunk_size)
+    assert not streamed
+    assert list(streamed) == []
+    assert streamed.get("currentpage") == 3
+    missing = page({"totalattendees": 0}, chunk_size)
+    assert list(missing) == []
+    assert missing.get("totalattendees") == 0
+
+
+def test_bool_peeks_without_losing_a_record():
+    streamed = page({"attendees": RECORDS}, 3)
+    assert streamed
+    assert list(streamed) == RECORDS
+
+
+def test_truncated_body_raises():
+    body = json.dumps({"attendees": RECORDS}).encode()[:-20]
+    with pytest.raises(ValueError):
+        list(StreamedPage(response(body), "attendees", chunk_size=5))
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_on_complete_after_the_last_field(chunk_size):
+    body = json.dumps({"attendees": RECORDS, "totalattendees": 4}, ensure_ascii=False).encode()
+    seen = []
+    streamed = StreamedPage(response(body), "attendees", chunk_size=chunk_size,
+                            on_complete=lambda p: seen.append((p.count, p.bytes_read, p.get("totalattendees"))))
+    assert seen == []
+    list(streamed)
+    assert seen == [(len(RECORDS), len(body), 4)]
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    kinds = ["int", "float", "str", "bool", "null"] + (["list", "dict"] if depth < 3 else [])
+    kind = rng.choice(kinds)
+    if kind == "int":
+        return rng.randint(-10 ** 12, 10 ** 12)
+    if kind == "float":
+        return rng.uniform(-1e6, 1e6)
+    if kind == "str":
+        return "".join(rng.choice('ab é☃\U0001F600"\\/\n\t') for _ in range(rng.randint(0, 8)))
+    if kind == "bool":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    if kind == "list":
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 3))}
+
+
+def test_random_documents():
+    rng = random.Random(24)
+    for _ in range(300):
+        records = [random_value(rng, 1) if rng.random() < 0.1 else {"eventuserid": i, "v": random_value(rng, 1)}
+                   for i in range(rng.randint(0, 6))]
+        document = {"registrants": records}
+        before = {f"b{i}": random_value(rng) for i in range(rng.randint(0, 2))}
+        after = {f"a{i}": random_value(rng) for i in range(rng.randint(0, 2))}
+        document = {**before, **document, **after}
+        streamed = page(document, rng.randint(1, 7), "registrants")
+        assert list(streamed) == records
+        assert streamed.fields == {**before, **after}
+
+
+@pytest.mark.parametrize("body", [b'{"attendees": [{"a": 1}]', b'{"attendees": [], "totalattendees": 1',
+                                  b'{"totalattendees": 1, '])
+def test_missing_closing_brace_raises(body):
+    with pytest.raises(ValueError):
+        list(StreamedPage(response(body), "attendees", chunk_size=4))
+
+
+class DroppingRaw(io.BytesIO):
+    """A response body whose connection drops after `drop_after` bytes."""
+
+    def __init__(self, body: bytes, drop_after: int):
+        super().__init__(body)
+        self.drop_after = drop_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.drop_after:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken: IncompleteRead")
+        return super().read(min(size, self.drop_after - self.tell()))
+
+
+def dropping(body: bytes, drop_after: int) -> requests.Response:
+    r = response(body)
+    r.raw = DroppingRaw(body, drop_after)
+    return r
+
+
+@pytest.mark.parametrize("drop_after", [1, 30, 90, 150])
+def test_dropped_connection_resumes_where_it_stopped(drop_after):
+    body = json.dumps({"currentpage": 0, "attendees": RECORDS, "totalattendees": 4}, ensure_ascii=False).encode()
+    assert drop_after < len(body)
+    reopened, completed = [], []
+
+    def reopen():
+        reopened.append(True)
+        return response(body)
+
+    streamed = StreamedPage(dropping(body, drop_after), "attendees", chunk_size=7, reopen=reopen, max_resumes=2,
+                            on_complete=lambda p: completed.append(p.count))
+    assert list(streamed) == RECORDS
+    assert streamed.get("totalattendees") == 4
+    assert streamed.resumes == len(reopened) == 1
+    assert completed == [len(RECORDS)]
+
+
+def test_dropped_connection_gives_up_after_max_resumes():
+    body = json.dumps({"attendees": RECORDS}).encode()
+    first = dropping(body, 40)
+    streamed = StreamedPage(first, "attendees", chunk_size=5, reopen=lambda: dropping(body, 40), max_resumes=2)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        list(streamed)
+    assert streamed.resumes == 2
+    assert first.raw.closed and streamed._response.raw.closed
+
+
+def test_dropped_connection_without_reopen_raises():
+    body = json.dumps({"attendees": RECORDS}).encode()
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        list(StreamedPage(dropping(body, 40), "attendees", chunk_size=5))
+
+
+def test_fewer_records_on_retry_raises():
+    body = json.dumps({"attendees": RECORDS}).encode()
+    shorter = json.dumps({"attendees": RECORDS[:1]}).encode()
+    streamed = StreamedPage(dropping(body, len(body) - 10), "attendees", chunk_size=5,
+                            reopen=lambda: response(shorter), max_resumes=1)
+    with pytest.raises(ValueError, match="fewer records"):
+        list(streamed)
+
+
+def test_stopping_early_closes_the_response():
+    r = response(json.dumps({"attendees": RECORDS}).encode())
+    records = iter(StreamedPage(r, "attendees", chunk_size=5))
+    next(records)
+    assert not r.raw.closed
+    records.close()
+    assert r.raw.closed
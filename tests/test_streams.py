@@ -0,0 +1,33 @@
+"""Child stream event selection from per-event bookmarks."""
+
+from datetime import timedelta
+
+from tap_on24.tap import TapON24
+
+CONFIG = {"client_id": "1", "access_token_key": "key", "access_token_secret": "secret", "activity_lookback_days": 7}
+
+
+def bookmark(last_activity):
+    return {"lastupdated": "2020-01-01T00:00:00+00:00", "total": 5, "record_count": 5,
+            "last_activity": last_activity.isoformat() if last_activity else None}
+
+
+def test_recently_active_events_come_from_bookmarks():
+    tap = TapON24(config=CONFIG, validate_config=False)
+    now = tap.now
+    state = {"bookmarks": {"attendees": {
+        "event_bookmarks": {"11": bookmark(now - timedelta(days=1)), "12": bookmark(now - timedelta(days=30)),
+                            "13": bookmark(None)},
+        "partitions": [{"context": {"eventid": 14}, "event_bookmarks": {"14": bookmark(now - timedelta(hours=2))}}],
+    }}}
+    tap = TapON24(config=CONFIG, state=state, validate_config=False)
+    attendees = tap.streams["attendees"]
+    assert attendees.recently_active_events() == [11, 14]
+    # Nothing in this run's index: the active ones are still candidates, with unknown totals
+    tap.event_index.mark_complete()
+    assert [eventid for eventid, _ in attendees.candidate_events()] == [11, 14]
+
+
+def test_no_lookback_no_rescan():
+    tap = TapON24(config={**CONFIG, "activity_lookback_days": 0}, validate_config=False)
+    assert tap.streams["attendees"].recently_active_events() == []
@@ -0,0 +1,40 @@
+"""TapON24 against the SDK entry points it relies on."""
+
+import contextlib
+import inspect
+import io
+import json
+
+from singer_sdk import Tap
+
+from tap_on24.tap import TapON24
+
+CONFIG = {"client_id": "1", "access_token_key": "key", "access_token_secret": "secret"}
+
+
+def test_events_sync_first():
+    tap = TapON24(config=CONFIG, validate_config=False)
+    assert list(tap.streams) == ["events", "attendees", "registrants"]
+    # The SDK's own order is by name, which would page /event from attendees first
+    assert list(Tap.streams.fget(tap)) == sorted(tap.streams)
+
+
+def test_cli_runs_through_sync_all():
+    # Run-wide setup and cleanup live in TapON24.sync_all: the CLI must still call it
+    assert "tap.sync_all()" in inspect.getsource(Tap.invoke)
+    assert "super().sync_all()" in inspect.getsource(TapON24.sync_all)
+
+
+def test_plan_is_written_to_stdout(on24_server):
+    tap = TapON24(config={**CONFIG, "api_url": on24_server.url, "on24_start_date": "2025-01-01",
+                          "on24_end_date": "2025-03-01", "items_per_page": 50}, state={})
+    tap.cli_plan = True
+    out = io.StringIO()
+    requests = on24_server.stats.as_dict()["requests"]
+    with contextlib.redirect_stdout(out):
+        tap.sync_all()
+    plan = json.loads(out.getvalue())
+    # 6 events of 130 attendees and 70 registrants, 50 per page; only /event was called
+    assert [len(plan["streams"][name]["work"]) for name in ("attendees", "registrants")] == [6, 6]
+    assert sum(item["pages"] for item in plan["streams"]["attendees"]["work"]) == 18
+    assert on24_server.stats.as_dict()["requests"] - requests == 1